@@ -1,7 +1,13 @@
 import argparse
-from sys import stdin, stderr
+import atexit
+import json
+from sys import stdin, stdout, stderr
 
-from math_methods.polynomial import Polynomial
+# Modules of comparison are imported by modes using them,
+# so the client of comparison server starts quickly.
+
+# Exit code of unavailable comparison server.
+CONNECTION_EXIT_CODE = 8
 
 # Arguments definition.
 parser = argparse.ArgumentParser(
@@ -20,14 +26,183 @@ compareGroup.add_argument(
 compareGroup.add_argument(
     '-m', '--match', help='set to compare number by match',
     action='store_true')
+compareGroup.add_argument(
+    '-r', '--randomized',
+    help='set to compare polynomials at random points without expansion',
+    action='store_true')
+parser.add_argument(
+    '-p', '--probability',
+    help='change default error probability of randomized comparison',
+    type=float, default=10**(-9), metavar='p')
 parser.add_argument(
     '-s', '--specific',
     help='show specific information about errors in polynomials',
     action='store_true')
 parser.add_argument('-f', '--file', help='an expressions file link',
                     metavar='file')
+parser.add_argument(
+    '-b', '--batch',
+    help='compare every pair of lines and print results as JSON Lines',
+    action='store_true')
+parser.add_argument(
+    '--cluster',
+    help='print cluster of equal polynomials of every line as JSON Lines',
+    action='store_true')
+parser.add_argument(
+    '-j', '--jobs', help='number of processes comparing pairs in batch mode',
+    type=int, default=1, metavar='n')
+parser.add_argument(
+    '-c', '--cache',
+    help='number of parsed expressions to keep in batch mode',
+    type=int, default=0, metavar='n')
+parser.add_argument(
+    '--store',
+    help='a database file keeping parsed expressions and results between runs',
+    metavar='file')
+parser.add_argument(
+    '--max-terms', help='maximal number of terms of expanded expression',
+    type=int, metavar='n')
+parser.add_argument(
+    '--max-degree', help='maximal degree of expanded expression',
+    type=int, metavar='n')
+parser.add_argument(
+    '--max-seconds', help='maximal time of expression expansion',
+    type=float, metavar='s')
+parser.add_argument(
+    '--stats',
+    help='print time, memory and terms of every stage as JSON to stderr',
+    action='store_true')
+parser.add_argument(
+    '--profile', help='a file to dump profile of the run for pstats',
+    metavar='file')
+serverGroup = parser.add_mutually_exclusive_group()
+serverGroup.add_argument(
+    '--serve',
+    help='answer comparison requests at Unix socket path or host:port',
+    metavar='address')
+serverGroup.add_argument(
+    '--connect',
+    help='compare expressions by the server at Unix socket path or host:port',
+    metavar='address')
 args = parser.parse_args()
 
+# Stages of worker processes of parallel batch are not measured.
+if args.stats:
+    from math_methods.stats import Stats
+    stats = Stats(memory=True)
+    stats.start()
+
+    def print_stats():
+        stats.stop()
+        print(json.dumps(stats.report(), sort_keys=True), file=stderr)
+
+    atexit.register(print_stats)
+
+if args.profile is not None:
+    import cProfile
+    profile = cProfile.Profile()
+
+    def dump_profile():
+        profile.disable()
+        profile.dump_stats(args.profile)
+
+    atexit.register(dump_profile)
+    profile.enable()
+
+if not 0 < args.probability < 1:
+    parser.error('error probability must be between 0 and 1')
+probability = args.probability if args.randomized else None
+
+limits = (args.max_terms, args.max_degree, args.max_seconds)
+if any(limit is not None and limit <= 0 for limit in limits):
+    parser.error('budget limits must be positive')
+if limits == (None, None, None):
+    budget = None
+else:
+    from math_methods.budget import Budget
+    budget = Budget(*limits)
+
+if args.match or args.randomized:
+    epsilon = None
+elif args.decimal is not None:
+    epsilon = 10**(-args.decimal)
+else:
+    epsilon = args.epsilon
+
+if args.serve is not None:
+    if args.first is not None or args.file is not None or \
+            args.batch or args.cluster:
+        parser.error('server reads expressions from requests')
+    if args.jobs < 1:
+        parser.error('number of jobs must be positive')
+    if args.cache < 0:
+        parser.error('cache size can not be negative')
+    from math_methods.server import serve
+    try:
+        serve(args.serve, args.jobs, budget, args.cache, args.store)
+    except (FileExistsError, ValueError) as exception:
+        parser.error(str(exception))
+    exit(0)
+
+if args.cluster:
+    if args.first is not None:
+        parser.error('expressions are read from file or stdin in cluster mode')
+    if args.batch or args.randomized or args.jobs != 1 or \
+            args.connect is not None:
+        parser.error('cluster mode can not be combined with batch, ' +
+                     'randomized, parallel or server comparison')
+    if args.cache < 0:
+        parser.error('cache size can not be negative')
+    from math_methods.batch import write_records
+    from math_methods.cache import PolynomialCache
+    from math_methods.clustering import cluster_expressions
+    from math_methods.store import PolynomialStore
+    store = None if args.store is None else PolynomialStore(args.store)
+    cache = PolynomialCache(args.cache, store) if args.cache else None
+    lines = stdin if args.file is None else open(args.file)
+    with lines:
+        write_records(cluster_expressions(
+            lines, epsilon, args.specific, cache, store, budget), stdout)
+    exit(0)
+
+if args.jobs != 1 and not args.batch:
+    parser.error('number of jobs can be set only in batch or server mode')
+if args.cache != 0 and not args.batch:
+    parser.error('cache size can be set only in batch, cluster ' +
+                 'or server mode')
+if args.connect is not None and (args.batch or args.store is not None or
+                                 budget is not None):
+    parser.error('batch mode, store and limits are not used by the client')
+
+if args.batch:
+    if args.first is not None:
+        parser.error('expressions are read from file or stdin in batch mode')
+    if args.jobs < 1:
+        parser.error('number of jobs must be positive')
+    if args.cache < 0:
+        parser.error('cache size can not be negative')
+    from math_methods.batch import compare_pairs, compare_pairs_parallel
+    from math_methods.batch import read_pairs, write_records
+    from math_methods.cache import PolynomialCache
+    from math_methods.store import PolynomialStore
+    lines = stdin if args.file is None else open(args.file)
+    with lines:
+        if args.jobs == 1:
+            store = None if args.store is None \
+                else PolynomialStore(args.store)
+            cache = PolynomialCache(args.cache, store) if args.cache \
+                else None
+            records = compare_pairs(
+                read_pairs(lines), epsilon, args.specific, cache, store,
+                probability, budget)
+        else:
+            records = compare_pairs_parallel(
+                read_pairs(lines), args.jobs, epsilon, args.specific,
+                cache_size=args.cache, store_path=args.store,
+                probability=probability, budget=budget)
+        write_records(records, stdout)
+    exit(0)
+
 expressionPair = []
 
 if args.first is not None:
@@ -70,42 +245,30 @@ def print_error_message(number: int):
         print('Error in second expression.\n', file=stderr)
 
 
-try:
-    first = Polynomial(expressionPair[0])
-except SyntaxError as exception:
-    print_error_message(1)
-    if args.specific:
-        print(str(exception), file=stderr)
-    exit(3)
-except ValueError as exception:
-    print_error_message(1)
-    if args.specific:
-        print(str(exception), file=stderr)
-    exit(4)
+if args.connect is not None:
+    from math_methods.client import send_request
+    try:
+        record = send_request(args.connect, {
+            'kind': 'compare', 'pair': expressionPair, 'epsilon': epsilon,
+            'probability': probability, 'specific': True})
+    except (OSError, ValueError) as exception:
+        print('Comparison server is not available: {0}\n'.format(exception),
+              file=stderr)
+        exit(CONNECTION_EXIT_CODE)
+else:
+    from math_methods.batch import compare_pair
+    from math_methods.store import PolynomialStore
+    store = None if args.store is None else PolynomialStore(args.store)
+    record = compare_pair(tuple(expressionPair), epsilon, True, store=store,
+                          probability=probability, budget=budget)
 
-try:
-    second = Polynomial(expressionPair[1])
-except SyntaxError as exception:
-    print_error_message(2)
-    if args.specific:
-        print(str(exception), file=stderr)
-    exit(5)
-except ValueError as exception:
-    print_error_message(2)
+if record['error'] is not None:
+    print_error_message(record.get('expression'))
     if args.specific:
-        print(str(exception), file=stderr)
-    exit(6)
-
-if args.match:
-    equals = first == second
-else:
-    if args.decimal is not None:
-        epsilon = 10**(-args.decimal)
-    else:
-        epsilon = args.epsilon
-    equals = first.compare_by_epsilon(second, epsilon)
+        print(record['message'], file=stderr)
+    exit(record['exit_code'])
 
-if equals:
+if record['verdict'] == 'equal':
     print('Polynomials are equal.')
     exit(0)
 else:
@@ -0,0 +1,69 @@
+import argparse
+from time import perf_counter
+
+import pathmagic
+from math_methods import multiplication
+from math_methods.polynomial import Polynomial
+
+parser = argparse.ArgumentParser(
+    description='Measures Karatsuba multiplication of dense polynomials' +
+                ' with several thresholds against schoolbook multiplication.')
+parser.add_argument(
+    '-s', '--sizes', help='numbers of terms of operands',
+    type=int, nargs='+', default=[64, 256, 1024], metavar='n')
+parser.add_argument(
+    '-t', '--thresholds', help='Karatsuba thresholds to measure',
+    type=int, nargs='+', default=[8, 16, 32, 64, 128], metavar='n')
+parser.add_argument(
+    '-r', '--repeat', help='number of measurements, the best one is taken',
+    type=int, default=3, metavar='n')
+args = parser.parse_args()
+
+
+def dense_operand(size: int, seed: int) -> Polynomial:
+    """
+    Univariate polynomial with every power below size
+    and integer coefficients too big for machine words.
+    """
+    polynomial = Polynomial(None)
+    for power in range(size):
+        polynomial.add_term(((('x', power),) if power else ()),
+                            (power * power * seed + 1) % 1000003 * 10**20)
+    return polynomial
+
+
+def measure(first: Polynomial, second: Polynomial, threshold: int) -> tuple:
+    multiplication.KARATSUBA_THRESHOLD = threshold
+    best = None
+    for _ in range(args.repeat):
+        start = perf_counter()
+        product = multiplication.multiply_terms(first.terms, second.terms)
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, {signature: coefficient
+                  for signature, coefficient in product if coefficient}
+
+
+configured = multiplication.KARATSUBA_THRESHOLD
+print('{0:>8} {1:>10} {2}'.format(
+    'terms', 'schoolbook',
+    ' '.join('{0:>10}'.format(threshold) for threshold in args.thresholds)))
+for size in args.sizes:
+    first = dense_operand(size, 3)
+    second = dense_operand(size, 7)
+    schoolbook, expected = measure(first, second, size + 1)
+    times = []
+    for threshold in args.thresholds:
+        elapsed, product = measure(first, second, threshold)
+        if product != expected:
+            raise ArithmeticError(
+                'Karatsuba product differs with threshold {0}.'.format(
+                    threshold))
+        times.append(elapsed)
+    print('{0:>8} {1:>10.4f} {2}'.format(
+        size, schoolbook,
+        ' '.join('{0:>10.4f}'.format(elapsed) for elapsed in times)))
+    best = args.thresholds[times.index(min(times))]
+    print('{0:>8} best threshold {1}, configured {2}'.format(
+        '', best, configured))
+multiplication.KARATSUBA_THRESHOLD = configured
@@ -0,0 +1,182 @@
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from os import path, remove
+from time import perf_counter
+
+import pathmagic
+import workloads
+from math_methods import expressions, parsing, polynomial, signatures
+from math_methods import validation
+from math_methods.polynomial import Polynomial, compose
+
+STAGES = ['validation', 'normalization', 'parsing', 'expansion',
+          'multiplication', 'compose', 'comparison', 'cli']
+# Differences of stages faster than this are measurement noise.
+NOISE_SECONDS = 0.001
+
+parser = argparse.ArgumentParser(
+    description='Measures stages of polynomial comparison on generated' +
+                ' workloads and compares results with a baseline.')
+parser.add_argument(
+    '-w', '--workloads', help='workloads to measure',
+    nargs='+', choices=sorted(workloads.WORKLOADS),
+    default=sorted(workloads.WORKLOADS), metavar='name')
+parser.add_argument(
+    '--stages', help='stages to measure', nargs='+', choices=STAGES,
+    default=STAGES, metavar='name')
+parser.add_argument(
+    '-n', '--count', help='number of expression pairs of every workload',
+    type=int, default=20, metavar='n')
+parser.add_argument(
+    '--seed', help='seed of generated expressions',
+    type=int, default=1, metavar='n')
+parser.add_argument(
+    '-r', '--repeat', help='number of measurements, the best one is taken',
+    type=int, default=3, metavar='n')
+parser.add_argument(
+    '-o', '--output', help='a file to save results as JSON',
+    metavar='file')
+parser.add_argument(
+    '-b', '--baseline', help='a file of results to compare with',
+    metavar='file')
+parser.add_argument(
+    '-t', '--threshold',
+    help='relative slowdown reported as regression, 0.2 by default',
+    type=float, default=0.2, metavar='share')
+args = parser.parse_args()
+
+
+def clear_caches() -> None:
+    """
+    Forgets shared subexpressions, expansions and evaluated numbers,
+    so every measurement starts cold.
+    """
+    expressions.sharedNodes.clear()
+    polynomial.expansions.clear()
+    signatures.interned.clear()
+    parsing.evaluate.cache_clear()
+    validation.evaluate_run.cache_clear()
+
+
+def build(expression: str):
+    try:
+        return Polynomial(expression)
+    except (ArithmeticError, SyntaxError, ValueError):
+        return None
+
+
+def run_cli(pairs: list) -> None:
+    with tempfile.NamedTemporaryFile('w', suffix='.txt',
+                                     delete=False) as file:
+        for pair in pairs:
+            file.write('\n'.join(pair) + '\n')
+    try:
+        subprocess.run([sys.executable, path.join(path.dirname(
+            path.abspath(__file__)), path.pardir), '-b', '-f', file.name],
+            stdout=subprocess.DEVNULL, check=True)
+    finally:
+        remove(file.name)
+
+
+def stage_action(stage: str, pairs: list):
+    """
+    Returns function running the stage on all pairs of the workload.
+    Operands of multiplication, raising and comparison are built
+    in advance.
+    """
+    strings = [string for pair in pairs for string in pair]
+    if stage == 'validation':
+        def action():
+            for string in strings:
+                validation.find_errors(string)
+    elif stage == 'normalization':
+        def action():
+            for string in strings:
+                parsing.normalize_expression(string)
+    elif stage == 'parsing':
+        def action():
+            for string in strings:
+                try:
+                    expressions.parse(string)
+                except SyntaxError:
+                    pass
+    elif stage == 'expansion':
+        def action():
+            for string in strings:
+                build(string)
+    elif stage == 'cli':
+        def action():
+            run_cli(pairs)
+    else:
+        built = [(build(first), build(second)) for first, second in pairs]
+        built = [(first, second) for first, second in built
+                 if first is not None and second is not None]
+        if stage == 'multiplication':
+            def action():
+                for first, second in zip(built, built[1:]):
+                    first[0] * second[1]
+        elif stage == 'compose':
+            def action():
+                for first, _ in built:
+                    compose(first, 2)
+        else:
+            def action():
+                for first, second in built:
+                    first.compare_by_epsilon(second, 10**-6)
+    return action
+
+
+def measure(action) -> float:
+    best = None
+    for _ in range(args.repeat):
+        clear_caches()
+        start = perf_counter()
+        action()
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+results = {}
+for name in args.workloads:
+    pairs = workloads.generate(name, args.seed, args.count)
+    results[name] = {stage: measure(stage_action(stage, pairs))
+                     for stage in args.stages}
+
+baseline = None
+if args.baseline is not None:
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    if (baseline['seed'], baseline['count']) != (args.seed, args.count):
+        print('Baseline workloads have different seed or count.',
+              file=sys.stderr)
+        exit(2)
+
+print('{0:<10} {1:<15} {2:>10} {3:>10} {4:>8}'.format(
+    'workload', 'stage', 'seconds', 'baseline', 'ratio'))
+regressions = 0
+for name, stages in results.items():
+    for stage, elapsed in stages.items():
+        previous = None if baseline is None else \
+            baseline['results'].get(name, {}).get(stage)
+        if previous is None:
+            print('{0:<10} {1:<15} {2:>10.4f}'.format(name, stage, elapsed))
+            continue
+        regression = elapsed > previous * (1 + args.threshold) and \
+            elapsed - previous > NOISE_SECONDS
+        regressions += regression
+        print('{0:<10} {1:<15} {2:>10.4f} {3:>10.4f} {4:>8.2f}{5}'.format(
+            name, stage, elapsed, previous,
+            elapsed / previous if previous else float('inf'),
+            ' regression' if regression else ''))
+
+if args.output is not None:
+    with open(args.output, 'w') as file:
+        json.dump({'seed': args.seed, 'count': args.count,
+                   'results': results}, file, indent=2, sort_keys=True)
+if regressions:
+    print('{0} regressions.'.format(regressions), file=sys.stderr)
+    exit(1)
@@ -0,0 +1,124 @@
+from random import Random
+
+# Variable names, "i" is the imaginary unit and "j" is renamed to it.
+VARIABLES = 'xyzwabcdefghklmnopqrstuv'
+# Mistakes inserted into incorrect expressions.
+ERRORS = ['*/', ')', '/x', '^y', '$', '/(2-2)', '^0.5']
+
+# Parameters of generated workloads: number of variables,
+# number of summands of every sum, number of bracket groups
+# of every product, depth of nested groups, maximal exponent
+# of groups, complex coefficients and share of incorrect expressions.
+WORKLOADS = {
+    'flat': dict(variables=3, terms=12, depth=1, nesting=0, exponent=1),
+    'powers': dict(variables=3, terms=3, depth=1, nesting=1, exponent=12),
+    'products': dict(variables=4, terms=3, depth=3, nesting=1, exponent=1),
+    'nested': dict(variables=2, terms=2, depth=2, nesting=3, exponent=1),
+    'wide': dict(variables=12, terms=4, depth=2, nesting=1, exponent=1),
+    'complex': dict(variables=2, terms=3, depth=2, nesting=1, exponent=3,
+                    complex_coefficients=True),
+    'errors': dict(variables=3, terms=4, depth=2, nesting=1, exponent=2,
+                   errors=0.5),
+}
+
+
+class Generator:
+    """
+    Generates random polynomial expressions, the same seed
+    gives the same expressions.
+    """
+    def __init__(self, seed: int, variables: int = 3, terms: int = 3,
+                 depth: int = 1, nesting: int = 1, exponent: int = 2,
+                 complex_coefficients: bool = False,
+                 errors: float = 0) -> None:
+        self.random = Random(seed)
+        self.variables = VARIABLES[:variables]
+        self.terms = terms
+        self.depth = depth
+        self.nesting = nesting
+        self.exponent = exponent
+        self.complex_coefficients = complex_coefficients
+        self.errors = errors
+
+    def coefficient(self) -> str:
+        random = self.random
+        if self.complex_coefficients and random.random() < 0.5:
+            return '({0}{1}{2}i)'.format(random.randint(1, 9),
+                                         random.choice('+-'),
+                                         random.randint(1, 9))
+        if random.random() < 0.2:
+            return '{0}.{1}'.format(random.randint(0, 9),
+                                    random.randint(1, 99))
+        return str(random.randint(1, 20))
+
+    def monomial(self) -> str:
+        random = self.random
+        parts = [self.coefficient()]
+        count = random.randint(1, min(3, len(self.variables)))
+        for variable in random.sample(self.variables, count):
+            power = random.randint(1, 3)
+            parts.append(variable if power == 1
+                         else '{0}^{1}'.format(variable, power))
+        return ''.join(parts)
+
+    def sum(self, level: int) -> str:
+        summands = [self.summand(level) for _ in range(self.terms)]
+        result = summands[0]
+        for summand in summands[1:]:
+            result += self.random.choice((' + ', ' - ')) + summand
+        return result
+
+    def summand(self, level: int) -> str:
+        if level == 0:
+            return self.monomial()
+        factors = []
+        for _ in range(self.depth):
+            group = '({0})'.format(self.sum(level - 1))
+            exponent = self.random.randint(1, self.exponent)
+            factors.append(group if exponent == 1
+                           else '{0}^{1}'.format(group, exponent))
+        return self.coefficient() + '*'.join(factors)
+
+    def expression(self) -> str:
+        """
+        Returns expression, some of them are incorrect
+        if share of errors is set.
+        """
+        expression = self.sum(self.nesting)
+        if self.random.random() < self.errors:
+            position = self.random.randint(0, len(expression))
+            expression = expression[:position] + \
+                self.random.choice(ERRORS) + expression[position:]
+        return expression
+
+    def equivalent(self, expression: str) -> str:
+        """
+        The same polynomial written with summands in reversed order.
+        """
+        depth = 0
+        summands = []
+        start = 0
+        for index, symbol in enumerate(expression):
+            if symbol == '(':
+                depth += 1
+            elif symbol == ')':
+                depth -= 1
+            elif symbol in '+-' and depth == 0 and index > start:
+                summands.append(expression[start:index].strip())
+                start = index
+        summands.append(expression[start:].strip())
+        summands = ['+' + summand if summand[0] not in '+-' else summand
+                    for summand in reversed(summands)]
+        return ' '.join(summands)
+
+
+def generate(name: str, seed: int, count: int) -> list:
+    """
+    Generates pairs of equivalent expressions of the workload.
+    """
+    generator = Generator(seed, **WORKLOADS[name])
+    pairs = []
+    for _ in range(count):
+        expression = generator.expression()
+        pairs.append((expression, generator.equivalent(expression)))
+    return pairs
@@ -1 +1,5 @@
-__all__ = ['complicated_errors', 'parsing', 'polynomial', 'trivial_errors']
+__all__ = ['batch', 'budget', 'cache', 'client', 'clustering',
+           'complicated_errors', 'dense', 'expressions', 'horner',
+           'identity', 'multiplication', 'packed', 'parsing', 'polynomial',
+           'server', 'signatures', 'stats', 'store', 'trivial_errors',
+           'validation', 'vectorized']
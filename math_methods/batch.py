@@ -0,0 +1,249 @@
+import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from math_methods.budget import Budget, BudgetExceededError
+from math_methods.cache import PolynomialCache
+from math_methods.expressions import Node
+from math_methods.identity import compare_trees, parse_expression
+from math_methods.polynomial import Polynomial
+from math_methods.store import PolynomialStore
+
+# Exit codes of expression errors, the first number is for
+# syntax errors, the second one is for value errors.
+ERROR_CODES = {1: (3, 4), 2: (5, 6)}
+# Exit code of expressions exceeding the budget of expansion.
+BUDGET_EXIT_CODE = 7
+# Exit code of expressions too big to compute without a budget:
+# numbers overflow, nesting is too deep or memory runs out.
+RESOURCE_EXIT_CODE = 9
+RESOURCE_ERRORS = (OverflowError, RecursionError, MemoryError)
+# Cache and store of the worker process, they are created by the first chunk.
+workerCache = None
+workerStore = None
+
+
+def read_pairs(lines):
+    """
+    Groups consecutive non-empty lines into expression pairs.
+    Lines are consumed lazily, the last expression without
+    a pair is yielded alone.
+    """
+    pair = []
+    for line in lines:
+        cut = line.replace('\n', '')
+        if cut != '':
+            pair.append(cut)
+        if len(pair) == 2:
+            yield tuple(pair)
+            pair = []
+    if pair:
+        yield tuple(pair)
+
+
+def compare_pair(pair: tuple, epsilon: float = None,
+                 specific: bool = False, cache: PolynomialCache = None,
+                 store: PolynomialStore = None,
+                 probability: float = None, budget: Budget = None) -> dict:
+    """
+    Compares expression pair and describes the result the same way
+    the command line interface does it. Numbers are compared
+    by match if epsilon is None. If probability is set, expressions
+    are compared at random points with this error probability.
+    Records of pairs compared before are taken from the store
+    without parsing. If budget is set, it limits expansion
+    of every expression.
+    """
+    mode = epsilon if probability is None else ['randomized', probability]
+    record = None
+    if store is not None and len(pair) == 2:
+        record = store.get_record(pair, mode)
+    if record is None:
+        record = describe_pair(pair, epsilon, cache, store, probability,
+                               budget)
+        if store is not None and len(pair) == 2 and \
+                record['error'] in (None, 'SyntaxError', 'ValueError'):
+            store.put_record(pair, mode, record)
+    if not specific:
+        record.pop('message', None)
+    return record
+
+
+def build_polynomial(expression: str, cache: PolynomialCache = None,
+                     store: PolynomialStore = None,
+                     budget: Budget = None) -> Polynomial:
+    if budget is not None:
+        with budget:
+            return build_polynomial(expression, cache, store)
+    if cache is not None:
+        return cache.get(expression)
+    if store is not None:
+        return store.get_polynomial(expression)
+    return Polynomial(expression)
+
+
+def describe_error(record: dict, number: int, exception: Exception) -> dict:
+    # Unexpected errors are reported too,
+    # one broken pair must not stop the batch.
+    record['error'] = type(exception).__name__
+    record['expression'] = number
+    if isinstance(exception, (SyntaxError, ValueError)):
+        record['exit_code'] = ERROR_CODES[number][
+            isinstance(exception, ValueError)]
+    elif isinstance(exception, BudgetExceededError):
+        record['exit_code'] = BUDGET_EXIT_CODE
+    elif isinstance(exception, RESOURCE_ERRORS):
+        record['exit_code'] = RESOURCE_EXIT_CODE
+    record['message'] = str(exception)
+    return record
+
+
+def describe_pair(pair: tuple, epsilon: float = None,
+                  cache: PolynomialCache = None,
+                  store: PolynomialStore = None,
+                  probability: float = None, budget: Budget = None) -> dict:
+    record = {'verdict': None, 'error': None, 'exit_code': 1}
+    if len(pair) < 2:
+        record['error'] = 'MissingExpression'
+        record['message'] = 'There is no second expression ' + \
+            'to parse and compare to gained.'
+        return record
+    operands = []
+    for number, expression in enumerate(pair, 1):
+        try:
+            operand = None
+            if probability is not None:
+                operand = parse_expression(expression)
+            if operand is None:
+                operand = build_polynomial(expression, cache, store,
+                                           budget)
+            operands.append(operand)
+        except Exception as exception:
+            return describe_error(record, number, exception)
+    first, second = operands
+    equals = None
+    if probability is not None:
+        if isinstance(first, Node) and isinstance(second, Node):
+            equals = compare_trees(first, second, probability)
+        if equals is None:
+            # Expansion is the fallback of randomized comparison.
+            for number, expression in enumerate(pair, 1):
+                if isinstance(operands[number - 1], Node):
+                    try:
+                        operands[number - 1] = build_polynomial(
+                            expression, cache, store, budget)
+                    except Exception as exception:
+                        return describe_error(record, number, exception)
+            first, second = operands
+    if equals is None:
+        if epsilon is None:
+            equals = first == second
+        else:
+            equals = first.compare_by_epsilon(second, epsilon)
+    record['verdict'] = 'equal' if equals else 'not equal'
+    record['exit_code'] = 0 if equals else 1
+    return record
+
+
+def describe_expression(expression: str, specific: bool = False,
+                        cache: PolynomialCache = None,
+                        store: PolynomialStore = None,
+                        budget: Budget = None) -> dict:
+    """
+    Checks single expression and describes the result the same way
+    comparison does it, correct expressions have number of terms.
+    """
+    record = {'error': None, 'exit_code': 1}
+    try:
+        record['terms'] = len(build_polynomial(expression, cache, store,
+                                               budget).terms)
+        record['exit_code'] = 0
+    except Exception as exception:
+        describe_error(record, 1, exception)
+        del record['expression']
+        if not specific:
+            del record['message']
+    return record
+
+
+def compare_pairs(pairs, epsilon: float = None, specific: bool = False,
+                  cache: PolynomialCache = None,
+                  store: PolynomialStore = None, probability: float = None,
+                  budget: Budget = None):
+    """
+    Lazily compares expression pairs, records are numbered from zero.
+    """
+    for index, pair in enumerate(pairs):
+        record = compare_pair(pair, epsilon, specific, cache, store,
+                              probability, budget)
+        record['index'] = index
+        yield record
+
+
+def open_worker(cache_size: int = 0, store_path: str = None) -> None:
+    """
+    Creates cache and store of the worker process
+    if they are not created yet.
+    """
+    global workerCache, workerStore
+    if store_path is not None and workerStore is None:
+        workerStore = PolynomialStore(store_path)
+    if cache_size and workerCache is None:
+        workerCache = PolynomialCache(cache_size, workerStore)
+
+
+def compare_chunk(pairs: list, start: int, epsilon: float = None,
+                  specific: bool = False, cache_size: int = 0,
+                  store_path: str = None, probability: float = None,
+                  budget: Budget = None) -> list:
+    """
+    Compares chunk of pairs in worker process.
+    """
+    open_worker(cache_size, store_path)
+    records = []
+    for index, pair in enumerate(pairs, start):
+        record = compare_pair(pair, epsilon, specific, workerCache,
+                              workerStore, probability, budget)
+        record['index'] = index
+        records.append(record)
+    return records
+
+
+def compare_pairs_parallel(pairs, jobs: int, epsilon: float = None,
+                           specific: bool = False, chunk_size: int = 64,
+                           cache_size: int = 0, store_path: str = None,
+                           probability: float = None,
+                           budget: Budget = None):
+    """
+    Compares expression pairs in a pool of processes. Pairs are
+    submitted by chunks, at most two chunks per process are in flight,
+    so the memory use doesn't depend on the number of pairs.
+    Records are yielded in the order of pairs. Every process has
+    its own cache if cache size is set and its own connection
+    to the store if store path is set.
+    """
+    pairs = iter(pairs)
+    pending = deque()
+    start = 0
+    with ProcessPoolExecutor(jobs) as executor:
+        while True:
+            while len(pending) < 2 * jobs:
+                chunk = list(islice(pairs, chunk_size))
+                if not chunk:
+                    break
+                pending.append(executor.submit(
+                    compare_chunk, chunk, start, epsilon, specific,
+                    cache_size, store_path, probability, budget))
+                start += len(chunk)
+            if not pending:
+                break
+            yield from pending.popleft().result()
+
+
+def write_records(records, output) -> None:
+    """
+    Writes records as JSON Lines, one record per line.
+    """
+    for record in records:
+        output.write(json.dumps(record, sort_keys=True) + '\n')
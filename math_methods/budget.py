@@ -0,0 +1,178 @@
+from time import monotonic
+
+from math_methods import expressions
+
+# Budget active in this process, it is set by the with statement.
+current = None
+
+
+class BudgetExceededError(Exception):
+    """
+    Expansion of expression needs more resources than its budget allows.
+    It is not a syntax or value error, so the expression
+    is not parsed again by the slicing parser.
+    """
+
+
+class Budget:
+    """
+    Limits of polynomial expansion: number of terms, degree
+    and wall-clock time in seconds, None means no limit. Limits apply
+    to polynomials built inside the with statement, expression trees
+    are rejected by estimation before expansion and expansion
+    checks the limits cooperatively.
+    """
+    def __init__(self, max_terms: int = None, max_degree: int = None,
+                 max_seconds: float = None) -> None:
+        for limit in (max_terms, max_degree, max_seconds):
+            if limit is not None and limit <= 0:
+                raise ValueError('Budget limits must be positive.')
+        self.max_terms = max_terms
+        self.max_degree = max_degree
+        self.max_seconds = max_seconds
+        self.deadline = None
+        self.previous = None
+
+    def __enter__(self):
+        global current
+        self.previous = current
+        if self.max_seconds is not None:
+            self.deadline = monotonic() + self.max_seconds
+        current = self
+        return self
+
+    def __exit__(self, *exception) -> None:
+        global current
+        current = self.previous
+        self.previous = None
+        self.deadline = None
+
+    def check(self, terms: int = 0, degree: int = 0) -> None:
+        """
+        Raises BudgetExceededError if number of terms, degree
+        or time spent since the start of the budget exceeds the limits.
+        """
+        if self.max_terms is not None and terms > self.max_terms:
+            raise BudgetExceededError(
+                'Number of terms {0} exceeds the limit of {1}.'
+                .format(terms, self.max_terms))
+        if self.max_degree is not None and degree > self.max_degree:
+            raise BudgetExceededError(
+                'Degree {0} exceeds the limit of {1}.'
+                .format(degree, self.max_degree))
+        if self.deadline is not None and monotonic() > self.deadline:
+            raise BudgetExceededError(
+                'Expansion takes more than {0} seconds.'
+                .format(self.max_seconds))
+
+    def check_tree(self, node: expressions.Node) -> None:
+        """
+        Rejects expression tree before expansion if its estimated
+        degree or number of terms exceeds the limits. Estimations
+        are upper bounds, terms cancelled out are counted too.
+        """
+        if self.max_degree is None and self.max_terms is None:
+            return
+        degree, terms = estimate_tree(node)
+        self.check(terms, degree)
+
+
+def check_budget(terms: int = 0, degree: int = 0) -> None:
+    """
+    Checks the limits of the active budget if there is one.
+    """
+    if current is not None:
+        current.check(terms, degree)
+
+
+def check_tree(node: expressions.Node) -> None:
+    """
+    Checks estimation of expression tree
+    against the active budget if there is one.
+    """
+    if current is not None:
+        current.check_tree(node)
+
+
+def binomial(total: int, part: int) -> int:
+    """
+    Binomial coefficient computed in part steps,
+    so part must be small.
+    """
+    result = 1
+    for step in range(1, part + 1):
+        result = result * (total - part + step) // step
+    return result
+
+
+def estimate_tree(node: expressions.Node) -> tuple:
+    """
+    Estimates degree and number of terms of the expanded expression
+    without expansion. Both are upper bounds: polynomial of degree d
+    in n variables has at most C(n + d, n) terms, sums and products
+    have at most as many terms as their operands together
+    and raising t terms to power k gives at most C(t + k - 1, k) terms.
+    Errors are not reported, expansion does it.
+    """
+    degree, terms, _ = expressions.run_nested(estimate_node(node))
+    return degree, terms
+
+
+def estimate_node(node: expressions.Node) -> tuple:
+    """
+    Generator of degree, number of terms and variables of the node
+    run by run_nested, so deeply nested trees are estimated.
+    """
+    operator = node.operator
+    if node.arithmetic:
+        return 0, 1, frozenset()
+    if operator == expressions.VARIABLE:
+        return 1, 1, frozenset((node.value,))
+    if operator in (expressions.NEGATION, expressions.RECIPROCAL):
+        return (yield estimate_node(node.operands[0]))
+    if operator == expressions.POWER:
+        degree, terms, variables = yield estimate_node(node.operands[0])
+        exponent = estimate_exponent(node.operands[1])
+        degree *= exponent
+        if terms > 1:
+            # Long products are not computed, the bound
+            # by number of variables is used then.
+            part = min(terms - 1, exponent)
+            terms = binomial(terms - 1 + exponent, part) \
+                if part <= len(variables) else None
+    else:
+        estimations = []
+        for operand in node.operands:
+            estimations.append((yield estimate_node(operand)))
+        variables = frozenset().union(
+            *(estimation[2] for estimation in estimations))
+        if operator == expressions.SUM:
+            degree = max(estimation[0] for estimation in estimations)
+            terms = sum(estimation[1] for estimation in estimations)
+        else:
+            degree = sum(estimation[0] for estimation in estimations)
+            terms = 1
+            for estimation in estimations:
+                terms *= estimation[1]
+    bound = binomial(len(variables) + degree, len(variables))
+    return degree, bound if terms is None else min(terms, bound), variables
+
+
+def estimate_exponent(node: expressions.Node) -> int:
+    """
+    Natural exponent the expansion would use,
+    incorrect exponents are estimated as one.
+    """
+    if not node.arithmetic:
+        return 1
+    try:
+        exponent = expressions.evaluate_tree(node)
+    except (ArithmeticError, SyntaxError, ValueError):
+        return 1
+    if isinstance(exponent, complex):
+        exponent = exponent.real
+    try:
+        exponent = int(round(exponent))
+    except (OverflowError, ValueError):
+        return 1
+    return exponent if exponent >= 0 else 1
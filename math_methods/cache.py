@@ -0,0 +1,58 @@
+from collections import OrderedDict
+
+from math_methods.parsing import normalize_expression
+from math_methods.polynomial import Polynomial
+from math_methods.validation import check_expression
+
+
+class PolynomialCache:
+    """
+    Least recently used cache of expanded polynomials
+    keyed by normalized expressions. Cached polynomials are frozen,
+    so callers can't corrupt them. Missing polynomials are taken
+    from persistent store if there is one.
+    """
+    def __init__(self, maxsize: int = 1024, store=None) -> None:
+        if maxsize < 1:
+            raise ValueError('Cache size must be positive.')
+        self.maxsize = maxsize
+        self.store = store
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, string: str) -> Polynomial:
+        """
+        Returns frozen polynomial of expression, expression is parsed
+        only if there is no polynomial of the same normalized expression.
+        Errors are raised the same way Polynomial does it.
+        """
+        if not isinstance(string, str):
+            raise TypeError('Input must be string instance.')
+        # Different incorrect expressions may have the same
+        # normalized form, so they are checked before the lookup.
+        check_expression(string)
+        key = normalize_expression(string)
+        polynomial = self.entries.get(key)
+        if polynomial is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return polynomial
+        self.misses += 1
+        if self.store is None:
+            polynomial = Polynomial(string)
+        else:
+            polynomial = self.store.get_polynomial(string)
+        polynomial.freeze()
+        self.entries[key] = polynomial
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return polynomial
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,42 @@
+import json
+import socket
+from os import path
+
+# Client of comparison server doesn't import modules of comparison,
+# so it starts quickly.
+# Requests and responses are JSON Lines of at most this size.
+MAX_REQUEST_BYTES = 1 << 20
+
+
+def parse_address(address: str) -> tuple:
+    """
+    Splits "host:port" of TCP socket, any other address
+    is a path of Unix domain socket. Returns (host, port) or (path, None).
+    """
+    host, separator, port = address.rpartition(':')
+    if separator and port.isdigit() and path.sep not in address:
+        return host or 'localhost', int(port)
+    return address, None
+
+
+def send_request(address: str, request: dict,
+                 timeout: float = None) -> dict:
+    """
+    Sends single request to the server and waits for its response.
+    Raises OSError if the server is not available.
+    """
+    host, port = parse_address(address)
+    if port is None:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.settimeout(timeout)
+        connection.connect(host)
+    else:
+        connection = socket.create_connection((host, port), timeout)
+    with connection:
+        connection.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        connection.shutdown(socket.SHUT_WR)
+        with connection.makefile('rb') as stream:
+            line = stream.readline(MAX_REQUEST_BYTES)
+    if not line:
+        raise ConnectionError('Server closed connection without response.')
+    return json.loads(line.decode('utf-8'))
@@ -0,0 +1,142 @@
+from itertools import product
+
+from math_methods.batch import build_polynomial, describe_error
+from math_methods.budget import Budget
+from math_methods.cache import PolynomialCache
+from math_methods.polynomial import Polynomial, canonical_number
+from math_methods.store import PolynomialStore
+
+# Polynomials with more candidate buckets are compared
+# with every cluster of the same terms.
+CANDIDATES_LIMIT = 64
+
+
+def clustered_terms(polynomial: Polynomial) -> list:
+    """
+    Canonical terms with the constant term always present. Comparison
+    by epsilon compares a constant term with the zero one, so missing
+    constant term is clustered as zero. Polynomial without zero
+    constant term is not equal to one with small constant term,
+    comparison with cluster representatives finds it.
+    """
+    terms = polynomial.canonical_terms()
+    if not terms or terms[0][0] != ():
+        terms.insert(0, ((), canonical_number(0)))
+    return terms
+
+
+def bucket_candidates(polynomial: Polynomial, epsilon: float) -> list:
+    """
+    Quantizes coefficients to cells four times as wide as epsilon
+    with multiples of the width in the middle, so zero imaginary parts
+    and usual integers are far from borders. A coefficient closer
+    to a cell border than epsilon has two candidate cells, so every
+    polynomial equal by epsilon to the given one is in one
+    of the candidate buckets.
+    Returns None if there are too many candidates.
+    """
+    width = 4 * epsilon
+    cells = []
+    count = 1
+    for _, coefficient in clustered_terms(polynomial):
+        for part in coefficient:
+            candidates = {int((part + epsilon) // width),
+                          int((part + 3 * epsilon) // width)}
+            count *= len(candidates)
+            if count > CANDIDATES_LIMIT:
+                return None
+            cells.append(sorted(candidates))
+    return list(product(*cells))
+
+
+def find_bucket(polynomial: Polynomial, epsilon: float) -> tuple:
+    width = 4 * epsilon
+    return tuple(int((part + 2 * epsilon) // width)
+                 for _, coefficient in clustered_terms(polynomial)
+                 for part in coefficient)
+
+
+class Clusters:
+    """
+    Groups polynomials into equivalence classes. Exact clusters are
+    found by fingerprints, clusters by epsilon are found by quantized
+    coefficients, only polynomials near cell borders are compared
+    with several cluster representatives.
+    """
+    def __init__(self, epsilon: float = None) -> None:
+        # Comparison by zero epsilon is the exact one.
+        self.epsilon = epsilon if epsilon else None
+        self.representatives = []
+        # Cluster identifiers by fingerprints, or by term signatures
+        # and buckets if clusters are found by epsilon.
+        self.index = {}
+
+    def __len__(self) -> int:
+        return len(self.representatives)
+
+    def add(self, polynomial: Polynomial) -> int:
+        """
+        Returns cluster identifier of polynomial,
+        new clusters are numbered from zero.
+        """
+        if self.epsilon is None:
+            fingerprint = polynomial.fingerprint()
+            cluster = self.index.get(fingerprint)
+            if cluster is None:
+                cluster = self.index[fingerprint] = len(self.representatives)
+                self.representatives.append(polynomial)
+            return cluster
+        support = tuple(signature for signature, _ in
+                        clustered_terms(polynomial))
+        buckets = self.index.setdefault(support, {})
+        try:
+            candidates = bucket_candidates(polynomial, self.epsilon)
+        except (ArithmeticError, ValueError):
+            candidates = None
+        if candidates is None:
+            clusters = sorted(set().union(*buckets.values()))
+        else:
+            clusters = sorted(set().union(
+                *(buckets.get(bucket, ()) for bucket in candidates)))
+        for cluster in clusters:
+            if polynomial.compare_by_epsilon(self.representatives[cluster],
+                                             self.epsilon):
+                return cluster
+        cluster = len(self.representatives)
+        self.representatives.append(polynomial)
+        try:
+            own = find_bucket(polynomial, self.epsilon)
+        except (ArithmeticError, ValueError):
+            own = None
+        buckets.setdefault(own, []).append(cluster)
+        return cluster
+
+
+def cluster_expressions(lines, epsilon: float = None, specific: bool = False,
+                        cache: PolynomialCache = None,
+                        store: PolynomialStore = None,
+                        budget: Budget = None):
+    """
+    Lazily assigns cluster identifiers to expressions
+    of non-empty lines, records are numbered from zero.
+    Incorrect expressions and expressions exceeding the budget
+    get no cluster.
+    """
+    clusters = Clusters(epsilon)
+    index = 0
+    for line in lines:
+        expression = line.replace('\n', '')
+        if expression == '':
+            continue
+        record = {'index': index, 'cluster': None, 'error': None,
+                  'exit_code': 0}
+        try:
+            record['cluster'] = clusters.add(
+                build_polynomial(expression, cache, store, budget))
+        except Exception as exception:
+            describe_error(record, 1, exception)
+            del record['expression']
+            if not specific:
+                del record['message']
+        index += 1
+        yield record
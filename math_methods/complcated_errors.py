@@ -3,6 +3,7 @@ from math import trunc
 
 from math_methods.parsing import evaluate
 from math_methods.parsing import normalize_expression
+from math_methods.stats import measure
 
 
 def find_corresponding_bracket(string: str, index: int) -> int:
@@ -152,6 +153,7 @@ def check_raise_error(
             pass
 
 
+@measure('find_complicated_errors')
 def find_complicated_errors(string: str) -> str:
     for method in [check_division_error, check_raise_error]:
         result = method(string)
@@ -0,0 +1,201 @@
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from math_methods.polynomial import Polynomial
+
+# Dense representation is used for polynomials with at most
+# this number of variables and coefficient arrays of at most
+# this number of cells.
+MAX_VARIABLES = 2
+MAX_CELLS = 1 << 22
+# Convolution of arrays with at least this number of cells
+# in the smaller operand is computed by fast Fourier transform.
+FFT_THRESHOLD = 1 << 10
+# Integer results of fast Fourier transform are rounded
+# only if products of coefficient sums are below this bound.
+FFT_EXACT_BOUND = 1 << 40
+# Integer convolution is done in int64 below this bound.
+INTEGER_BOUND = 1 << 62
+# Operands are multiplied in dense representation only if their
+# arrays have at most this number of cells per term, sparse
+# polynomials of high degree are multiplied faster term by term.
+MAX_CELLS_PER_TERM = 4
+
+
+class DensePolynomial:
+    """
+    Polynomial of a few variables with integer coefficients as an int64
+    array of coefficients with an axis per variable, indexed by
+    exponents. Variables are sorted, so their order is the order of axes.
+    Only multiplication is done in dense representation, sums and
+    comparisons of polynomials walk their terms.
+    """
+    def __init__(self, variables: tuple, coefficients) -> None:
+        if numpy is None:
+            raise ImportError('Dense polynomials require numpy.')
+        self.variables = variables
+        self.coefficients = coefficients
+
+    @staticmethod
+    def from_polynomial(polynomial: Polynomial):
+        """
+        Converts polynomial to dense representation. Raises ValueError
+        if it has too many variables, too high degree or coefficients
+        which are not integers and OverflowError if a coefficient
+        can't be represented exactly.
+        """
+        variables = set()
+        for signature in polynomial.terms:
+            variables.update(variable for variable, _ in signature)
+        if len(variables) > MAX_VARIABLES:
+            raise ValueError('Too many variables for dense polynomial.')
+        variables = tuple(sorted(variables))
+        shape = [1] * len(variables)
+        for signature, monomial in polynomial.terms.items():
+            for variable, exponent in signature:
+                axis = variables.index(variable)
+                shape[axis] = max(shape[axis], exponent + 1)
+            coefficient = monomial.coefficient
+            if type(coefficient) is not int:
+                raise ValueError('Coefficient is not an integer.')
+            if abs(coefficient) >= INTEGER_BOUND:
+                raise OverflowError('Coefficient is too big.')
+        if cells(shape) > MAX_CELLS:
+            raise ValueError('Too high degree for dense polynomial.')
+        coefficients = numpy.zeros(shape, dtype=numpy.int64)
+        for signature, monomial in polynomial.terms.items():
+            index = [0] * len(variables)
+            for variable, exponent in signature:
+                index[variables.index(variable)] = exponent
+            coefficients[tuple(index)] += monomial.coefficient
+        return DensePolynomial(variables, coefficients)
+
+    def to_polynomial(self) -> Polynomial:
+        """
+        Converts dense polynomial back, zero coefficients are skipped.
+        """
+        polynomial = Polynomial(None)
+        for index in numpy.argwhere(self.coefficients):
+            index = tuple(index)
+            coefficient = self.coefficients[index].item()
+            signature = tuple((variable, int(exponent)) for variable, exponent
+                              in zip(self.variables, index) if exponent)
+            polynomial.add_term(signature, int(coefficient))
+        if not polynomial.terms:
+            polynomial.add_term((), 0)
+        return polynomial
+
+    def expand(self, variables: tuple):
+        """
+        Returns coefficients with axes of given variables,
+        those must include variables of this polynomial.
+        """
+        return self.coefficients.reshape(
+            [self.coefficients.shape[self.variables.index(variable)]
+             if variable in self.variables else 1 for variable in variables])
+
+    def common_variables(self, other) -> tuple:
+        variables = tuple(sorted(set(self.variables) | set(other.variables)))
+        if len(variables) > MAX_VARIABLES:
+            raise ValueError('Too many variables for dense polynomial.')
+        return variables
+
+    def __mul__(self, other):
+        variables = self.common_variables(other)
+        return DensePolynomial(variables, convolve(self.expand(variables),
+                                                   other.expand(variables)))
+
+
+def cells(shape) -> int:
+    result = 1
+    for size in shape:
+        result *= size
+    return result
+
+
+def convolve(first, second):
+    """
+    Multiplies integer coefficient arrays of equal dimensions exactly,
+    fast Fourier transform is used for large arrays if its rounding
+    error can't change integer results.
+    """
+    shape = [left + right - 1
+             for left, right in zip(first.shape, second.shape)]
+    # Sums are found in floating point numbers to avoid overflow.
+    bound = float(numpy.abs(first).sum(dtype=numpy.float64)) * \
+        float(numpy.abs(second).sum(dtype=numpy.float64))
+    if bound >= INTEGER_BOUND:
+        raise OverflowError('Product coefficients are too big.')
+    if first.ndim == 0:
+        return first * second
+    if min(first.size, second.size) >= FFT_THRESHOLD and \
+            bound < FFT_EXACT_BOUND:
+        axes = tuple(range(len(shape)))
+        result = numpy.fft.irfftn(numpy.fft.rfftn(first, shape, axes) *
+                                  numpy.fft.rfftn(second, shape, axes),
+                                  shape, axes)
+        return numpy.rint(result).astype(numpy.int64)
+    if first.ndim == 1:
+        return numpy.convolve(first, second)
+    result = numpy.zeros(shape, dtype=numpy.int64)
+    for row in range(first.shape[0]):
+        for otherRow in range(second.shape[0]):
+            result[row + otherRow] += numpy.convolve(first[row],
+                                                     second[otherRow])
+    return result
+
+
+def multiply(first: Polynomial, second: Polynomial) -> Polynomial:
+    """
+    Multiplies dense enough polynomials of a few variables with integer
+    coefficients in dense representation, results are the same
+    as the ones of schoolbook multiplication.
+    Returns None if polynomials are not suitable.
+    """
+    if numpy is None:
+        return None
+    try:
+        firstDense = DensePolynomial.from_polynomial(first)
+        secondDense = DensePolynomial.from_polynomial(second)
+        if firstDense.coefficients.size > \
+                MAX_CELLS_PER_TERM * len(first.terms) or \
+                secondDense.coefficients.size > \
+                MAX_CELLS_PER_TERM * len(second.terms):
+            return None
+        variables = firstDense.common_variables(secondDense)
+        if cells(left + right - 1 for left, right in zip(
+                firstDense.expand(variables).shape,
+                secondDense.expand(variables).shape)) > MAX_CELLS:
+            return None
+        productDense = firstDense * secondDense
+    except (ArithmeticError, ValueError):
+        return None
+    product = productDense.to_polynomial()
+    if has_zero_sums(first, second, firstDense, secondDense, productDense):
+        product.add_term((), 0)
+    return product
+
+
+def has_zero_sums(first: Polynomial, second: Polynomial,
+                  firstDense: DensePolynomial,
+                  secondDense: DensePolynomial,
+                  productDense: DensePolynomial) -> bool:
+    """
+    Checks if schoolbook multiplication adds zero to the constant
+    term: a product of terms is zero or like terms cancel each other
+    out. Terms contributing to every cell are counted by convolution
+    of nonzero cells.
+    """
+    for polynomial in (first, second):
+        for monomial in polynomial.terms.values():
+            if monomial.coefficient == 0:
+                return True
+    counts = DensePolynomial(
+        firstDense.variables,
+        (firstDense.coefficients != 0).astype(numpy.int64)) * \
+        DensePolynomial(secondDense.variables,
+                        (secondDense.coefficients != 0).astype(numpy.int64))
+    return bool(numpy.any((counts.coefficients != 0) &
+                          (productDense.coefficients == 0)))
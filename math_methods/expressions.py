@@ -0,0 +1,428 @@
+from collections import OrderedDict, namedtuple
+from operator import is_ as operator_is
+
+from math_methods.stats import measure
+
+# Token kinds.
+NUMBER = 'number'
+IMAGINARY = 'imaginary'
+VARIABLE = 'variable'
+PLUS = '+'
+MINUS = '-'
+MULTIPLY = '*'
+DIVIDE = '/'
+POWER = '^'
+OPEN = '('
+CLOSE = ')'
+UNKNOWN = 'unknown'
+
+# Node operators, leaves are numbers and variables.
+SUM = 'sum'
+PRODUCT = 'product'
+NEGATION = 'negation'
+RECIPROCAL = 'reciprocal'
+# Value of a product which is a run of numbers after division.
+RUN = 'run'
+
+Token = namedtuple('Token', ['kind', 'text', 'position'])
+
+DIGITS = '0123456789.,'
+OPERATORS = {'+': PLUS, '-': MINUS, '/': DIVIDE, ':': DIVIDE,
+             '^': POWER, '(': OPEN, ')': CLOSE}
+PRIMARY_STARTS = (NUMBER, IMAGINARY, VARIABLE, OPEN)
+# Shared nodes of at most this number of subexpressions are kept,
+# least recently used ones are dropped.
+SHARED_NODES_LIMIT = 1 << 16
+# Integer powers longer than this number of bits are not computed,
+# it would take minutes for exponents of a few digits like 9^9^9.
+MAX_POWER_BITS = 1 << 20
+
+sharedNodes = OrderedDict()
+
+
+@measure('tokenize')
+def tokenize(string: str) -> list:
+    """
+    Splits mathematical expression into tokens in a single pass.
+    Spaces between digits are removed the same way normalization
+    does it, so "1 000" is a single number. "i" is an imaginary unit,
+    variable "j" is renamed to "i" as in normalized expressions.
+    """
+    tokens = []
+    index = 0
+    length = len(string)
+    while index < length:
+        symbol = string[index]
+        if symbol == ' ':
+            index += 1
+        elif symbol in DIGITS:
+            start = index
+            digits = []
+            while index < length:
+                symbol = string[index]
+                if symbol in DIGITS:
+                    digits.append('.' if symbol == ',' else symbol)
+                    index += 1
+                elif symbol == ' ':
+                    following = index
+                    while following < length and string[following] == ' ':
+                        following += 1
+                    if following == length or string[following] not in DIGITS:
+                        break
+                    index = following
+                else:
+                    break
+            tokens.append(Token(NUMBER, ''.join(digits), start))
+        elif symbol == 'i':
+            tokens.append(Token(IMAGINARY, symbol, index))
+            index += 1
+        elif 'a' <= symbol <= 'z':
+            tokens.append(Token(VARIABLE, 'i' if symbol == 'j' else symbol,
+                                index))
+            index += 1
+        elif symbol == '*':
+            following = index + 1
+            while following < length and string[following] == ' ':
+                following += 1
+            if following < length and string[following] == '*':
+                tokens.append(Token(POWER, '**', index))
+                index = following + 1
+            else:
+                tokens.append(Token(MULTIPLY, symbol, index))
+                index += 1
+        elif symbol in OPERATORS:
+            tokens.append(Token(OPERATORS[symbol], symbol, index))
+            index += 1
+        else:
+            tokens.append(Token(UNKNOWN, symbol, index))
+            index += 1
+    return tokens
+
+
+def evaluate_number(text: str):
+    """
+    Converts number token to int or float
+    following python literals rules.
+    """
+    if '.' in text:
+        if text.count('.') > 1 or text == '.':
+            raise SyntaxError('Incorrect number: {0}.'.format(text))
+        return float(text)
+    if len(text) > 1 and text[0] == '0' and text.strip('0') != '':
+        raise SyntaxError(
+            'Leading zeros are not allowed: {0}.'.format(text))
+    return int(text)
+
+
+class Node:
+    """
+    Node of expression tree. Sums and products are n-ary,
+    subtracted terms are wrapped into negations
+    and divisors are wrapped into reciprocals.
+    Parsed nodes are shared, so they must not be changed.
+    """
+    __slots__ = ('operator', 'operands', 'value', 'arithmetic')
+
+    def __init__(self, operator: str, operands: list = (), value=None):
+        self.operator = operator
+        self.operands = operands
+        self.value = value
+        if operator == VARIABLE:
+            self.arithmetic = False
+        else:
+            self.arithmetic = all(operand.arithmetic for operand in operands)
+
+
+def make_node(operator: str, operands: list = (), value=None) -> Node:
+    """
+    Returns the shared node of given structure, so identical
+    subexpressions of all parsed expressions are a single node
+    while it is in the table. Operands are shared nodes already,
+    so they are compared by identity.
+    """
+    key = (operator, type(value), value, tuple(operands))
+    node = sharedNodes.get(key)
+    if node is None:
+        node = sharedNodes[key] = Node(operator, tuple(operands), value)
+        if len(sharedNodes) > SHARED_NODES_LIMIT:
+            sharedNodes.popitem(last=False)
+    else:
+        sharedNodes.move_to_end(key)
+    return node
+
+
+def run_nested(generator):
+    """
+    Runs generator of a recursive algorithm on an explicit stack:
+    instead of recursive calls it yields generators of the nested
+    steps and gets their results back, so the depth of nesting
+    is not limited by the recursion limit.
+    """
+    stack = [generator]
+    result = None
+    while stack:
+        try:
+            nested = stack[-1].send(result)
+        except StopIteration as stop:
+            stack.pop()
+            result = stop.value
+        else:
+            stack.append(nested)
+            result = None
+    return result
+
+
+class Parser:
+    """
+    Recursive descent parser, grammar in order of precedence:
+        sum     := term (("+" | "-") term)*
+        term    := unary (("*" | "/") unary | power)*
+        unary   := ("+" | "-") unary | power
+        power   := primary ("^" unary)?
+        primary := number | "i" | variable | "(" sum ")"
+    Juxtaposition is a multiplication. Parsing methods are generators
+    run by run_nested, so deeply nested brackets and long chains
+    of powers are parsed.
+    """
+    def __init__(self, tokens: list, run_divisors: bool = True):
+        self.tokens = tokens
+        self.position = 0
+        self.run_divisors = run_divisors
+
+    def peek(self, offset: int = 0) -> str:
+        position = self.position + offset
+        if position < len(self.tokens):
+            return self.tokens[position].kind
+        return None
+
+    def advance(self) -> Token:
+        if self.position >= len(self.tokens):
+            raise SyntaxError('Unexpected end of expression.')
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    @measure('parse')
+    def parse(self) -> Node:
+        node = run_nested(self.parse_sum())
+        if self.position < len(self.tokens):
+            token = self.tokens[self.position]
+            raise SyntaxError('Unexpected symbol {0} at {1} position.'
+                              .format(token.text, token.position))
+        return node
+
+    def parse_sum(self) -> Node:
+        operands = [(yield self.parse_term())]
+        while self.peek() in (PLUS, MINUS):
+            if self.advance().kind == MINUS:
+                operands.append(make_node(NEGATION,
+                                          [(yield self.parse_term())]))
+            else:
+                operands.append((yield self.parse_term()))
+        if len(operands) == 1:
+            return operands[0]
+        return make_node(SUM, operands)
+
+    def parse_term(self) -> Node:
+        operands = [(yield self.parse_unary())]
+        while True:
+            kind = self.peek()
+            if kind == MULTIPLY:
+                self.advance()
+                operands.append((yield self.parse_unary()))
+            elif kind == DIVIDE:
+                closed = self.is_closed(operands[-1])
+                self.advance()
+                operands.append(make_node(
+                    RECIPROCAL, [(yield self.parse_divisor(closed))]))
+            elif kind in PRIMARY_STARTS:
+                operands.append((yield self.parse_power()))
+            else:
+                break
+        if len(operands) == 1:
+            return operands[0]
+        return make_node(PRODUCT, operands)
+
+    def is_closed(self, node: Node) -> bool:
+        """
+        Checks if the factor before current position is a bracket group,
+        a variable or a power, normalization wraps all of them in brackets.
+        """
+        while node.operator == NEGATION:
+            node = node.operands[0]
+        return node.operator in (VARIABLE, POWER) or \
+            self.tokens[self.position - 1].kind == CLOSE
+
+    def parse_divisor(self, closed: bool) -> Node:
+        """
+        Division after a bracket group divides by the whole following
+        run of numbers, imaginary units, multiplications and divisions:
+        "x/2*3i" is "x/(2*3i)", but "2/2*3i" is "(2/2)*3i".
+        Numbers raised to a power are not a part of the run.
+        """
+        if not (self.run_divisors and closed) or not self.is_run_next():
+            return (yield self.parse_unary())
+        operands = [(yield self.parse_primary())]
+        while True:
+            kind = self.peek()
+            if kind in (NUMBER, IMAGINARY) and self.is_run_next():
+                operands.append((yield self.parse_primary()))
+            elif kind in (MULTIPLY, DIVIDE) and self.is_run_next(1):
+                self.advance()
+                operand = yield self.parse_primary()
+                if kind == DIVIDE:
+                    operand = make_node(RECIPROCAL, [operand])
+                operands.append(operand)
+            else:
+                break
+        if len(operands) == 1:
+            return operands[0]
+        return make_node(PRODUCT, operands, RUN)
+
+    def is_run_next(self, offset: int = 0) -> bool:
+        return self.peek(offset) in (NUMBER, IMAGINARY) and \
+            self.peek(offset + 1) != POWER
+
+    def parse_unary(self) -> Node:
+        kind = self.peek()
+        if kind == MINUS:
+            self.advance()
+            return make_node(NEGATION, [(yield self.parse_unary())])
+        if kind == PLUS:
+            self.advance()
+            return (yield self.parse_unary())
+        return (yield self.parse_power())
+
+    def parse_power(self) -> Node:
+        base = yield self.parse_primary()
+        if self.peek() == POWER:
+            self.advance()
+            return make_node(POWER, [base, (yield self.parse_unary())])
+        return base
+
+    def parse_primary(self) -> Node:
+        token = self.advance()
+        if token.kind == NUMBER:
+            return make_node(NUMBER, value=evaluate_number(token.text))
+        if token.kind == IMAGINARY:
+            return make_node(NUMBER, value=1j)
+        if token.kind == VARIABLE:
+            return make_node(VARIABLE, value=token.text)
+        if token.kind == OPEN:
+            node = yield self.parse_sum()
+            if self.advance().kind != CLOSE:
+                raise SyntaxError('Unbalanced brackets.')
+            if node.arithmetic:
+                # Bracket groups without variables are evaluated
+                # as a whole, division there is an ordinary one.
+                node = split_runs(node)
+            return node
+        raise SyntaxError('Unexpected symbol {0} at {1} position.'
+                          .format(token.text, token.position))
+
+
+def split_runs(node: Node) -> Node:
+    """
+    Returns the bracket group with divisions by runs of numbers
+    turned back into ordinary divisions in its products.
+    Shared nodes are not changed, changed parts are new nodes.
+    """
+    if node.operator == SUM:
+        operands = [split_term_runs(operand) for operand in node.operands]
+        if all(map(operator_is, operands, node.operands)):
+            return node
+        return make_node(SUM, operands)
+    return split_term_runs(node)
+
+
+def split_term_runs(node: Node) -> Node:
+    """
+    Splits runs of a term of the bracket group. Other terms
+    than products are nested bracket groups split when parsed.
+    """
+    if node.operator == NEGATION:
+        if node.operands[0].operator != PRODUCT:
+            return node
+        operand = split_term_runs(node.operands[0])
+        if operand is node.operands[0]:
+            return node
+        return make_node(NEGATION, [operand])
+    if node.operator == PRODUCT:
+        operands = []
+        for operand in node.operands:
+            divisor = operand.operands[0] if operand.operator == RECIPROCAL \
+                else None
+            if divisor is not None and divisor.value == RUN:
+                operands.append(make_node(RECIPROCAL, [divisor.operands[0]]))
+                operands.extend(divisor.operands[1:])
+            else:
+                operands.append(operand)
+    else:
+        return node
+    if len(operands) == len(node.operands) and \
+            all(map(operator_is, operands, node.operands)):
+        return node
+    return make_node(node.operator, operands, node.value)
+
+
+def parse(string: str) -> Node:
+    """
+    Builds expression tree of mathematical expression.
+    """
+    return Parser(tokenize(string)).parse()
+
+
+def check_power(base, exponent) -> None:
+    """
+    Raises OverflowError if integer power is too long to be computed.
+    """
+    if type(base) is int and type(exponent) is int and exponent > 1 and \
+            (abs(base).bit_length() - 1) * exponent > MAX_POWER_BITS:
+        raise OverflowError('Integer power is too big.')
+
+
+def evaluate_tree(node: Node):
+    """
+    Evaluates expression tree without variables
+    using python complex numbers semantics.
+    """
+    return run_nested(evaluate_node(node))
+
+
+def evaluate_node(node: Node):
+    """
+    Generator of evaluate_tree run by run_nested, operands
+    are evaluated from left to right as nested steps.
+    """
+    operator = node.operator
+    if operator == NUMBER:
+        return node.value
+    if operator == SUM:
+        result = None
+        for operand in node.operands:
+            if operand.operator == NEGATION:
+                value = yield evaluate_node(operand.operands[0])
+                result = -value if result is None else result - value
+            else:
+                value = yield evaluate_node(operand)
+                result = value if result is None else result + value
+        return result
+    if operator == PRODUCT:
+        result = yield evaluate_node(node.operands[0])
+        for operand in node.operands[1:]:
+            if operand.operator == RECIPROCAL:
+                result /= yield evaluate_node(operand.operands[0])
+            else:
+                result *= yield evaluate_node(operand)
+        return result
+    if operator == POWER:
+        base = yield evaluate_node(node.operands[0])
+        exponent = yield evaluate_node(node.operands[1])
+        check_power(base, exponent)
+        return base ** exponent
+    if operator == NEGATION:
+        return -(yield evaluate_node(node.operands[0]))
+    if operator == RECIPROCAL:
+        return 1 / (yield evaluate_node(node.operands[0]))
+    raise SyntaxError('Variable {0} can not be evaluated.'
+                      .format(node.value))
@@ -0,0 +1,100 @@
+from keyword import iskeyword
+
+# Polynomials are compiled into python functions evaluating
+# multivariate Horner scheme: terms are grouped by exponents of the first
+# variable, coefficients of its powers are polynomials in the rest
+# of variables evaluated by the same scheme. Every step of the scheme
+# is a separate statement, so the depth of expressions doesn't depend
+# on degree. Powers of variables needed by the scheme are computed
+# once at the start of evaluation, coefficients are closure constants.
+
+
+class Emitter:
+    """
+    Generates statements of Horner scheme of terms given as
+    (exponent vector, coefficient) pairs.
+    """
+    def __init__(self, variables: list) -> None:
+        self.variables = variables
+        self.constants = []
+        self.powers = set()
+        self.lines = []
+
+    def constant(self, coefficient) -> str:
+        self.constants.append(coefficient)
+        return '_k{0}'.format(len(self.constants) - 1)
+
+    def power(self, level: int, exponent: int) -> str:
+        variable = self.variables[level]
+        if exponent == 1:
+            return variable
+        self.powers.add((variable, exponent))
+        return '{0}_{1}'.format(variable, exponent)
+
+    def emit(self, terms: list, level: int = 0, depth: int = 0) -> str:
+        """
+        Generates statements evaluating terms in variables
+        from given level, returns name of the value.
+        """
+        if level == len(self.variables):
+            return self.constant(terms[0][1])
+        groups = {}
+        for term in terms:
+            groups.setdefault(term[0][level], []).append(term)
+        exponents = sorted(groups, reverse=True)
+        if exponents == [0]:
+            return self.emit(terms, level + 1, depth)
+        target = '_t{0}'.format(depth)
+        value = self.emit(groups[exponents[0]], level + 1, depth + 1)
+        self.lines.append('{0} = {1}'.format(target, value))
+        for previous, exponent in zip(exponents, exponents[1:]):
+            value = self.emit(groups[exponent], level + 1, depth + 1)
+            self.lines.append('{0} = {0} * {1} + {2}'.format(
+                target, self.power(level, previous - exponent), value))
+        if exponents[-1]:
+            self.lines.append('{0} = {0} * {1}'.format(
+                target, self.power(level, exponents[-1])))
+        return target
+
+
+def compile_terms(terms: list, zero=0):
+    """
+    Compiles nonzero terms given as (signature, coefficient) pairs
+    into a function of variables in alphabetical order, they may be
+    passed by name as well. Polynomial without terms is zero.
+    Names of variables are in variables attribute of the function.
+    """
+    variables = sorted({variable for signature, _ in terms
+                        for variable, _ in signature})
+    for variable in variables:
+        # Names with underscores may clash with names of powers.
+        if not variable.isidentifier() or iskeyword(variable) or \
+                '_' in variable:
+            raise ValueError(
+                'Variable {0} can not be compiled.'.format(variable))
+    positions = {variable: index for index, variable in enumerate(variables)}
+    vectors = []
+    for signature, coefficient in terms:
+        vector = [0] * len(variables)
+        for variable, exponent in signature:
+            vector[positions[variable]] = exponent
+        vectors.append((tuple(vector), coefficient))
+    emitter = Emitter(variables)
+    result = emitter.emit(vectors) if vectors else emitter.constant(zero)
+    lines = ['def build(_constants):']
+    if emitter.constants:
+        lines.append('    {0}, = _constants'.format(
+            ', '.join('_k{0}'.format(index)
+                      for index in range(len(emitter.constants)))))
+    lines.append('    def evaluate({0}):'.format(', '.join(variables)))
+    for variable, exponent in sorted(emitter.powers):
+        lines.append('        {0}_{1} = {0} ** {1}'.format(variable,
+                                                          exponent))
+    lines.extend('        ' + line for line in emitter.lines)
+    lines.append('        return {0}'.format(result))
+    lines.append('    return evaluate')
+    namespace = {}
+    exec(compile('\n'.join(lines), '<polynomial>', 'exec'), namespace)
+    function = namespace['build'](emitter.constants)
+    function.variables = tuple(variables)
+    return function
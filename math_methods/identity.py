@@ -0,0 +1,210 @@
+from fractions import Fraction
+from math import ceil, log
+from random import SystemRandom
+
+from math_methods import expressions
+from math_methods.stats import measure
+from math_methods.polynomial import natural_exponent
+from math_methods.validation import check_expression
+
+# Evaluation points and primes are taken from this interval.
+PRIME_BITS = 61
+# Witnesses of deterministic Miller-Rabin test for numbers below 3 * 10**24.
+WITNESSES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+random = SystemRandom()
+
+
+def is_prime(number: int) -> bool:
+    if number < 2:
+        return False
+    for witness in WITNESSES:
+        if number % witness == 0:
+            return number == witness
+    odd = number - 1
+    shift = 0
+    while odd % 2 == 0:
+        odd //= 2
+        shift += 1
+    for witness in WITNESSES:
+        value = pow(witness, odd, number)
+        if value in (1, number - 1):
+            continue
+        for _ in range(shift - 1):
+            value = value * value % number
+            if value == number - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def random_prime() -> tuple:
+    """
+    Returns random prime p = 1 (mod 4) and square root of -1 modulo p,
+    it is the image of the imaginary unit.
+    """
+    while True:
+        prime = random.getrandbits(PRIME_BITS) | (1 << PRIME_BITS - 1)
+        prime += 1 - prime % 4
+        if is_prime(prime):
+            break
+    base = 2
+    # Quadratic non-residue to the power (p - 1) / 4 is a root of -1.
+    while pow(base, (prime - 1) // 2, prime) != prime - 1:
+        base += 1
+    return prime, pow(base, (prime - 1) // 4, prime)
+
+
+def parse_expression(string: str):
+    """
+    Checks expression the same way Polynomial does it and returns
+    its tree. Returns None if the tree can't be evaluated exactly,
+    such expressions must be expanded.
+    """
+    if not isinstance(string, str):
+        raise TypeError('Input must be string instance.')
+    tokens = expressions.tokenize(string)
+    check_expression(string, tokens)
+    try:
+        node = expressions.Parser(tokens).parse()
+        degree(node)
+    except (ArithmeticError, RecursionError, SyntaxError, ValueError):
+        return None
+    return node
+
+
+def degree(node) -> int:
+    """
+    Finds upper bound of the polynomial degree.
+    Raises ValueError if expression is not a polynomial
+    and ArithmeticError if its numbers can't be evaluated.
+    """
+    if node.arithmetic:
+        # Expansion fails on such numbers, so they are evaluated here.
+        expressions.evaluate_tree(node)
+        return 0
+    operator = node.operator
+    if operator == expressions.VARIABLE:
+        return 1
+    if operator == expressions.SUM:
+        return max(degree(operand) for operand in node.operands)
+    if operator == expressions.PRODUCT:
+        return sum(degree(operand) for operand in node.operands)
+    if operator == expressions.POWER:
+        base, exponent = node.operands
+        if not exponent.arithmetic:
+            raise ValueError('Exponent function found.')
+        return degree(base) * natural_exponent(
+            expressions.evaluate_tree(exponent))
+    if operator == expressions.NEGATION:
+        return degree(node.operands[0])
+    raise ValueError('Rational function found.')
+
+
+def reduce_number(value, prime: int, unit: int) -> int:
+    """
+    Maps number to the residue field, decimal fractions are exact.
+    """
+    if isinstance(value, complex):
+        return (reduce_number(value.real, prime, unit) +
+                unit * reduce_number(value.imag, prime, unit)) % prime
+    if isinstance(value, float):
+        value = Fraction(repr(value))
+        return value.numerator * \
+            pow(value.denominator, prime - 2, prime) % prime
+    return value % prime
+
+
+def integer_exponent(value) -> int:
+    if isinstance(value, complex):
+        if value.imag != 0:
+            raise ValueError('Complex exponent can not be reduced.')
+        value = value.real
+    if isinstance(value, float):
+        if value != int(value):
+            raise ValueError('Irrational number can not be reduced.')
+        value = int(value)
+    return value
+
+
+def evaluate_modulo(node, point: dict, prime: int, unit: int) -> int:
+    """
+    Evaluates expression tree modulo prime at point,
+    which maps variables to residues.
+    """
+    operator = node.operator
+    if operator == expressions.NUMBER:
+        return reduce_number(node.value, prime, unit)
+    if operator == expressions.VARIABLE:
+        return point[node.value]
+    if operator == expressions.SUM:
+        result = 0
+        for operand in node.operands:
+            result += evaluate_modulo(operand, point, prime, unit)
+        return result % prime
+    if operator == expressions.PRODUCT:
+        result = 1
+        for operand in node.operands:
+            result = result * \
+                evaluate_modulo(operand, point, prime, unit) % prime
+        return result
+    if operator == expressions.POWER:
+        base, exponent = node.operands
+        exponent = integer_exponent(expressions.evaluate_tree(exponent))
+        if exponent == 0:
+            return 1
+        base = evaluate_modulo(base, point, prime, unit)
+        if exponent < 0:
+            base = inverse(base, prime)
+        return pow(base, abs(exponent), prime)
+    if operator == expressions.NEGATION:
+        return -evaluate_modulo(node.operands[0], point, prime, unit) % prime
+    return inverse(evaluate_modulo(node.operands[0], point, prime, unit),
+                   prime)
+
+
+def inverse(value: int, prime: int) -> int:
+    if value == 0:
+        # Divisor is zero only modulo this prime.
+        raise ZeroDivisionError('Divisor is divisible by prime.')
+    return pow(value, prime - 2, prime)
+
+
+def collect_variables(node, variables: set) -> set:
+    if node.operator == expressions.VARIABLE:
+        variables.add(node.value)
+    elif not node.arithmetic:
+        for operand in node.operands:
+            collect_variables(operand, variables)
+    return variables
+
+
+@measure('compare_trees')
+def compare_trees(first, second, probability: float = 10**-9):
+    """
+    Checks if two expression trees are the same polynomial by
+    evaluating them at random points modulo random primes.
+    Different polynomials are reported equal with probability lower
+    than the given one, equal polynomials are always reported equal.
+    Returns None if trees can't be evaluated exactly.
+    """
+    bound = max(degree(first), degree(second), 1)
+    # Schwartz-Zippel lemma: the difference of different polynomials
+    # vanishes at random point with probability bound / prime at most.
+    failure = bound / 2**(PRIME_BITS - 1)
+    if failure >= 0.5:
+        return None
+    trials = max(1, ceil(log(probability) / log(failure)))
+    variables = collect_variables(second, collect_variables(first, set()))
+    for _ in range(trials):
+        prime, unit = random_prime()
+        point = {variable: random.randrange(prime)
+                 for variable in variables}
+        try:
+            if evaluate_modulo(first, point, prime, unit) != \
+                    evaluate_modulo(second, point, prime, unit):
+                return False
+        except (ArithmeticError, ValueError):
+            return None
+    return True
@@ -0,0 +1,193 @@
+from heapq import heapify, heappop, heapreplace
+from operator import itemgetter
+
+from math_methods.packed import ExponentVectors, Packing, multiply_packed
+
+# Products of operands with fewer terms than this threshold
+# are computed by schoolbook multiplication, smaller thresholds
+# are slower by benchmarks/multiplication_benchmark.py.
+KARATSUBA_THRESHOLD = 32
+# Operands are split only if three products of halves
+# take at most this share of schoolbook term pairs.
+KARATSUBA_SAVING = 0.85
+
+
+def multiply_terms(first: dict, second: dict) -> list:
+    """
+    Multiplies terms of two polynomials with packed signatures.
+    Large operands with integer coefficients are multiplied
+    by Karatsuba method, results are the same as the ones
+    of schoolbook multiplication.
+    Returns a list of (signature, coefficient) pairs
+    or None if signatures can't be packed.
+    """
+    packing = Packing.for_terms(first, second)
+    if packing is None:
+        return None
+    firstPacked = packing.pack_terms(first)
+    secondPacked = packing.pack_terms(second)
+    if min(len(first), len(second)) >= KARATSUBA_THRESHOLD and \
+            is_exact(firstPacked) and is_exact(secondPacked):
+        firstNonzero = {key: coefficient
+                        for key, coefficient in firstPacked.items()
+                        if coefficient}
+        secondNonzero = {key: coefficient
+                         for key, coefficient in secondPacked.items()
+                         if coefficient}
+        products = karatsuba(firstNonzero, secondNonzero)
+        zero = len(firstNonzero) < len(firstPacked) or \
+            len(secondNonzero) < len(secondPacked) or \
+            has_zero_sums(firstNonzero, secondNonzero, products)
+        products = {key: coefficient for key, coefficient in products.items()
+                    if coefficient}
+        if zero:
+            # Schoolbook multiplication adds zero products and like
+            # terms cancelling each other out to the constant term.
+            products.setdefault(0, 0)
+    else:
+        products = multiply_packed(firstPacked, secondPacked)
+    return [(packing.unpack(key), coefficient)
+            for key, coefficient in products.items()]
+
+
+def is_exact(terms: dict) -> bool:
+    """
+    Checks if coefficients are integers, the order
+    of their additions doesn't change results then.
+    """
+    for coefficient in terms.values():
+        if type(coefficient) is not int:
+            return False
+    return True
+
+
+def has_zero_sums(first: dict, second: dict, products: dict) -> bool:
+    """
+    Checks if like terms of the product cancel each other out, that is
+    a zero product has a key which is a sum of keys of operands.
+    Other zero products are left by combination of products of halves.
+    """
+    if len(first) > len(second):
+        first, second = second, first
+    for key, coefficient in products.items():
+        if not coefficient and \
+                any(key - firstKey in second for firstKey in first):
+            return True
+    return False
+
+
+def split_terms(terms: dict, split: int) -> tuple:
+    """
+    Splits terms into terms with keys lower than split
+    and the rest with keys decreased by split.
+    """
+    low = {}
+    high = {}
+    for key, coefficient in terms.items():
+        if key < split:
+            low[key] = coefficient
+        else:
+            high[key - split] = coefficient
+    return low, high
+
+
+def add_packed(first: dict, second: dict, shift: int = 0,
+               factor: int = 1) -> None:
+    """
+    Adds terms of second multiplied by factor
+    with keys increased by shift to first in place.
+    """
+    for key, coefficient in second.items():
+        key += shift
+        first[key] = first.get(key, 0) + factor * coefficient
+
+
+def karatsuba(first: dict, second: dict) -> dict:
+    """
+    Multiplies terms with packed signatures and integer coefficients
+    treating packed signatures as exponents of a single variable.
+    Products of halves are A0 B0, A1 B1 and (A0 + A1)(B0 + B1),
+    operands are split only while it reduces the number
+    of multiplied term pairs. Result may contain zero terms.
+    """
+    if min(len(first), len(second)) < KARATSUBA_THRESHOLD:
+        return multiply_packed(first, second)
+    split = (min(min(first), min(second)) +
+             max(max(first), max(second)) + 1) // 2
+    firstLow, firstHigh = split_terms(first, split)
+    secondLow, secondHigh = split_terms(second, split)
+    firstSum = dict(firstLow)
+    add_packed(firstSum, firstHigh)
+    secondSum = dict(secondLow)
+    add_packed(secondSum, secondHigh)
+    pairs = len(firstLow) * len(secondLow) + \
+        len(firstHigh) * len(secondHigh) + len(firstSum) * len(secondSum)
+    if split == 0 or \
+            pairs > KARATSUBA_SAVING * len(first) * len(second):
+        return multiply_packed(first, second)
+    low = karatsuba(firstLow, secondLow) if firstLow and secondLow else {}
+    high = karatsuba(firstHigh, secondHigh) \
+        if firstHigh and secondHigh else {}
+    middle = karatsuba(firstSum, secondSum)
+    result = dict(low)
+    add_packed(result, middle, split)
+    add_packed(result, low, split, -1)
+    add_packed(result, high, split, -1)
+    add_packed(result, high, 2 * split)
+    return result
+
+
+def iterate_product(first: dict, second: dict):
+    """
+    Lazily generates nonzero terms of the product of two polynomials
+    as (signature, coefficient) pairs in lexicographic order
+    of exponents of sorted variables by Johnson's heap method.
+    Like terms are combined as soon as they are generated, the heap
+    holds one entry per term of the smaller factor, so working memory
+    doesn't depend on the size of the product.
+    """
+    if len(first) > len(second):
+        first, second = second, first
+    layout = Packing.for_terms(first, second) or \
+        ExponentVectors.for_terms(first, second)
+    add = layout.add
+    firstTerms = sort_terms(first, layout)
+    secondTerms = sort_terms(second, layout)
+    if not firstTerms or not secondTerms:
+        return
+    secondKey = secondTerms[0][0]
+    heap = [(add(key, secondKey), index, 0)
+            for index, (key, _) in enumerate(firstTerms)]
+    heapify(heap)
+    last = len(secondTerms) - 1
+    currentKey = None
+    current = 0
+    while heap:
+        key, index, position = heap[0]
+        coefficient = firstTerms[index][1] * secondTerms[position][1]
+        if key == currentKey:
+            current += coefficient
+        else:
+            if current != 0:
+                yield layout.unpack(currentKey), current
+            currentKey = key
+            current = coefficient
+        if position < last:
+            position += 1
+            heapreplace(heap, (add(firstTerms[index][0],
+                                   secondTerms[position][0]),
+                               index, position))
+        else:
+            heappop(heap)
+    if current != 0:
+        yield layout.unpack(currentKey), current
+
+
+def sort_terms(terms: dict, layout: Packing) -> list:
+    """
+    Returns nonzero terms as (packed signature, coefficient)
+    pairs sorted by packed signatures.
+    """
+    return sorted(((layout.pack(signature), monomial.coefficient)
+                   for signature, monomial in terms.items()
+                   if monomial.coefficient != 0), key=itemgetter(0))
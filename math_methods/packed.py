@@ -0,0 +1,136 @@
+from operator import add
+
+from math_methods.budget import check_budget
+
+# Packed exponent vectors are Kronecker substitutions: exponent
+# of every variable occupies its own field of an integer,
+# so the product of monomials is the sum of their packed forms.
+# The first variable has the most significant field, so packed
+# vectors are ordered lexicographically.
+
+# Packed exponent vectors fit into a machine word of this size,
+# polynomials needing more bits keep tuple signatures.
+PACKED_BITS = 63
+
+
+class Packing:
+    """
+    Layout of packed exponent vectors: sorted variables
+    and the width of their fields in bits.
+    """
+    def __init__(self, variables: list, width: int) -> None:
+        self.variables = variables
+        self.width = width
+        self.shifts = {variable: (len(variables) - 1 - index) * width
+                       for index, variable in enumerate(variables)}
+        self.mask = (1 << width) - 1
+
+    @staticmethod
+    def for_terms(*termsList, product: bool = True):
+        """
+        Finds layout fitting exponents of products of signatures,
+        one taken from every given mapping of terms, or exponents
+        of every signature if product is False.
+        Returns None if packed vectors would overflow machine word.
+        """
+        degrees = {}
+        for terms in termsList:
+            maximums = {}
+            for signature in terms:
+                for variable, exponent in signature:
+                    if exponent > maximums.get(variable, 0):
+                        maximums[variable] = exponent
+            for variable, exponent in maximums.items():
+                if product:
+                    degrees[variable] = degrees.get(variable, 0) + exponent
+                else:
+                    degrees[variable] = max(degrees.get(variable, 0),
+                                            exponent)
+        if not degrees:
+            return Packing([], 1)
+        width = max(degrees.values()).bit_length()
+        if width * len(degrees) > PACKED_BITS:
+            return None
+        return Packing(sorted(degrees), width)
+
+    def pack(self, signature: tuple) -> int:
+        shifts = self.shifts
+        key = 0
+        for variable, exponent in signature:
+            key += exponent << shifts[variable]
+        return key
+
+    def unpack(self, key: int) -> tuple:
+        signature = []
+        for variable in reversed(self.variables):
+            exponent = key & self.mask
+            if exponent:
+                signature.append((variable, exponent))
+            key >>= self.width
+        return tuple(reversed(signature))
+
+    def pack_terms(self, terms: dict) -> dict:
+        """
+        Maps packed signatures to coefficients of given terms.
+        """
+        return {self.pack(signature): monomial.coefficient
+                for signature, monomial in terms.items()}
+
+    @staticmethod
+    def add(first: int, second: int) -> int:
+        return first + second
+
+
+class ExponentVectors(Packing):
+    """
+    Layout of exponents too big for machine word: exponent vectors
+    are tuples, they are ordered the same way packed vectors are.
+    """
+    def __init__(self, variables: list) -> None:
+        self.variables = variables
+        self.indices = {variable: index
+                        for index, variable in enumerate(variables)}
+
+    @staticmethod
+    def for_terms(*termsList):
+        variables = set()
+        for terms in termsList:
+            for signature in terms:
+                variables.update(variable for variable, _ in signature)
+        return ExponentVectors(sorted(variables))
+
+    def pack(self, signature: tuple) -> tuple:
+        vector = [0] * len(self.variables)
+        for variable, exponent in signature:
+            vector[self.indices[variable]] = exponent
+        return tuple(vector)
+
+    def unpack(self, vector: tuple) -> tuple:
+        return tuple((variable, exponent) for variable, exponent
+                     in zip(self.variables, vector) if exponent)
+
+    @staticmethod
+    def add(first: tuple, second: tuple) -> tuple:
+        return tuple(map(add, first, second))
+
+
+def multiply_packed(first: dict, second: dict) -> dict:
+    """
+    Schoolbook multiplication of terms given as mappings
+    from packed signatures to coefficients.
+    """
+    secondItems = list(second.items())
+    products = {}
+    for key, coefficient in first.items():
+        check_budget(len(products))
+        for otherKey, otherCoefficient in secondItems:
+            product = coefficient * otherCoefficient
+            if product == 0.0:
+                productKey = 0
+            else:
+                productKey = key + otherKey
+            if productKey in products:
+                products[productKey] += product
+            else:
+                products[productKey] = product
+    return products
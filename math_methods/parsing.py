@@ -1,6 +1,10 @@
 import re
+from functools import lru_cache
 from math import trunc
 
+from math_methods import expressions
+from math_methods.stats import measure
+
 
 def cut_composition_lexemes(string: str) -> dict:
     """
@@ -76,6 +80,7 @@ def update_dict_key(dictionary: dict, key: str, value: str) -> None:
         dictionary[key] += '+' + value
 
 
+@measure('normalize_expression')
 def normalize_expression(string: str) -> str:
     string = string.replace(' ', '').replace(',', '.') \
         .replace('**', '^').replace(':', '/')
@@ -199,30 +204,27 @@ def swap(string: str, first: str, second: str) -> str:
     return result
 
 
+@lru_cache(maxsize=4096)
 def evaluate(expression: str):
     """
-    Evaluates given expression.
+    Evaluates given normalized arithmetic expression
+    without eval(), results are memoized on expression text.
+    Numbers, imaginary unit "j", "+", "-", "*", "/", "^"
+    and brackets are supported, python complex numbers
+    semantics is kept. Both syntax errors and division
+    by zero raise SyntaxError.
     """
-    original = expression
-    # Replacing caret with double asterisk.
-    expression = expression.replace('^', '**')
-    # Separating double imaginary unit with asterisk.
-    expression = expression.replace('jj', 'j*j').replace('jj', 'j*j')
-    # Adding asterisk between number
-    # and imaginary unit.
-    expression = re.sub('(\d)j', '\g<1>*j', expression)
-    expression = re.sub('j(\d)', 'j*\g<1>', expression)
-    # Adding coefficient before imaginary unit.
-    expression = re.sub('(\D|^)j', '\g<1>1j', expression)
-    # Adding asterisk before opening brackets
-    # if number, imaginary unit or enclosing
-    # bracket was before opening one.
-    expression = re.sub('([\dj)])\(', '\g<1>*(', expression)
-
+    tokens = expressions.tokenize(swap(expression, 'i', 'j'))
     try:
-        return eval(expression)
-    except (SyntaxError, ZeroDivisionError):
-        raise SyntaxError(swap(original, 'i', 'j'))
+        for previous, token in zip(tokens, tokens[1:]):
+            # Numbers can not follow the enclosing bracket immediately.
+            if previous.kind == expressions.CLOSE and \
+                    token.kind in (expressions.NUMBER, expressions.IMAGINARY):
+                raise SyntaxError(expression)
+        tree = expressions.Parser(tokens, run_divisors=False).parse()
+        return expressions.evaluate_tree(tree)
+    except (RecursionError, SyntaxError, ZeroDivisionError):
+        raise SyntaxError(swap(expression, 'i', 'j'))
 
 
 def check_and_parse_lexeme_and_exponent_pair(lexeme: str,
@@ -252,7 +254,9 @@ def check_and_parse_lexeme_and_exponent_pair(lexeme: str,
             'Failed evaluating exponent: {0}.'.format(str(exception)))
     if check_arithmetic(evaluatedLexeme):
         try:
-            return evaluate(evaluatedLexeme) ** evaluatedExponent, 1
+            evaluatedLexeme = evaluate(evaluatedLexeme)
+            expressions.check_power(evaluatedLexeme, evaluatedExponent)
+            return evaluatedLexeme ** evaluatedExponent, 1
         except SyntaxError as exception:
             raise SyntaxError(
                 'Failed evaluating lexeme: {0}.'.format(str(exception)))
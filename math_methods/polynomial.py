@@ -1,104 +1,392 @@
 import re
-from copy import deepcopy
+from collections import OrderedDict
+from hashlib import sha256
+from math import isfinite, trunc
+from operator import itemgetter
+from types import MappingProxyType
 
-from math_methods import parsing
-from math_methods.complcated_errors import find_complicated_errors
+from math_methods import expressions, parsing
+from math_methods.expressions import check_power
+from math_methods.budget import check_budget, check_tree
+from math_methods.horner import compile_terms
 from math_methods.parsing import \
     check_and_parse_lexeme_and_exponent_pair as parse
+from math_methods.multiplication import iterate_product, multiply_terms
 from math_methods.parsing import swap
-from math_methods.trivial_errors import find_trivival_errors
+from math_methods.signatures import MONOMIAL_ORDERS, intern_signature
+from math_methods.signatures import multiply_signatures, power_signature
+from math_methods.stats import measure
+from math_methods.validation import check_expression
+
+# Products with at least this number of term pairs
+# are tried in dense representation.
+DENSE_THRESHOLD = 1 << 12
 
 
 class Polynomial:
     """
-    Class represents polynomial as a list of monomials.
+    Class represents polynomial as a mapping from monomial
+    signatures to monomials with those signatures.
     """
+    frozen = False
+
     def __init__(self, string) -> None:
         """
         Create a Polynomial instance using mathematical expression.
         """
-        self.monomials = []
+        self.terms = {}
         if string is not None:
             if not isinstance(string, str):
                 raise TypeError('Input must be string instance.')
-            errorCheckMethods = [find_trivival_errors, find_complicated_errors]
-            for method in errorCheckMethods:
-                errorMessage = method(string)
-                if errorMessage is not None:
-                    if 'function' in errorMessage:
-                        raise ValueError(errorMessage)
-                    raise SyntaxError(errorMessage)
-            string = parsing.normalize_expression(string)
-            result = parse_composition(string)
-            if isinstance(result, Monomial):
-                self.monomials = [result]
+            tokens = expressions.tokenize(string)
+            check_expression(string, tokens)
+            try:
+                node = expressions.Parser(tokens).parse()
+                check_tree(node)
+                result = expand_tree(node)
+            except (ArithmeticError, RecursionError, SyntaxError,
+                    ValueError):
+                # Expression tree evaluation does not know how to
+                # describe the error and recursive descent is too deep
+                # for very nested expressions, slicing parser does both.
+                result = parse_slicing(string)
+            if isinstance(result, Polynomial):
+                self.terms = result.terms
+            elif isinstance(result, Monomial):
+                self.add_term(result.signature, result.coefficient)
             else:
-                self.monomials = result.monomials
+                self.add_term((), result)
+
+    def __setattr__(self, name: str, value) -> None:
+        if self.frozen:
+            raise TypeError('Frozen polynomial can not be changed.')
+        object.__setattr__(self, name, value)
+        if name == 'terms':
+            # Normal forms by monomial orders and the compiled form
+            # are cached until terms are changed.
+            object.__setattr__(self, 'cached', {})
+
+    def freeze(self):
+        """
+        Makes polynomial and its monomials immutable, so it can be shared.
+        In place operators return new polynomials instead.
+        """
+        if not self.frozen:
+            for monomial in self.terms.values():
+                monomial.freeze()
+            self.terms = MappingProxyType(self.terms)
+            self.frozen = True
+        return self
+
+    @property
+    def monomials(self) -> list:
+        """
+        List of copies of monomials in insertion order, changing
+        them doesn't change the polynomial and its cached forms.
+        """
+        return [monomial.copy() for monomial in self.terms.values()]
+
+    @monomials.setter
+    def monomials(self, monomials: list) -> None:
+        self.terms = {}
+        for monomial in monomials:
+            self.insert_monomial(monomial)
+
+    def add_term(self, signature: tuple, coefficient) -> None:
+        """
+        Adds coefficient to the term with given signature in place.
+        New monomial is allocated only if there is no similar term yet.
+        """
+        if self.cached:
+            self.cached.clear()
+        if coefficient == 0.0:
+            signature = ()
+        existing = self.terms.get(signature)
+        if existing is None:
+            # Interned signature of the monomial is the key as well.
+            monomial = Monomial.from_signature(signature, coefficient)
+            self.terms[monomial.signature] = monomial
+            return
+        existing.coefficient += coefficient
+        if existing.coefficient == 0.0 and signature:
+            # Similar monomials cancelled each other out,
+            # zero belongs to the constant term.
+            del self.terms[signature]
+            self.add_term((), existing.coefficient)
+
+    def add_product(self, first: tuple, second: tuple,
+                    coefficient) -> None:
+        """
+        Adds product of two terms given by their signatures
+        and coefficients product without building the product monomial.
+        """
+        self.add_term(multiply_signatures(first, second), coefficient)
+
+    def insert_monomial(self, monomial) -> None:
+        """
+        Puts monomial into the polynomial,
+        combining it with the similar one if there is such.
+        """
+        self.add_term(monomial.signature, monomial.coefficient)
+
+    def scale(self, factor) -> None:
+        """
+        Multiplies every coefficient by factor in place.
+        """
+        self.cached.clear()
+        if factor == 0.0:
+            self.terms = {}
+            self.add_term((), factor)
+            return
+        for monomial in self.terms.values():
+            monomial.coefficient = factor * monomial.coefficient
+
+    def copy(self):
+        new = Polynomial(None)
+        for signature, monomial in self.terms.items():
+            new.terms[signature] = monomial.copy()
+        return new
+
+    def get_monomial(self, item):
+        """
+        Returns the monomial similar to item
+        or None if there is no such monomial.
+        """
+        return self.terms.get(item.signature)
 
     def find_monomial(self, item) -> int:
         """
         Returns an index of item in list of monomials
         or -1 if this monomials is not in this list.
         """
-        for index in range(len(self.monomials)):
-            if self.monomials[index] == item:
+        signature = item.signature
+        if signature not in self.terms:
+            return -1
+        for index, key in enumerate(self.terms):
+            if key == signature:
                 return index
-        return -1
 
     def is_sub_polynomial(self, other, epsilon: float) -> bool:
         if not isinstance(other, Polynomial):
             raise TypeError('Only polynomial can be sub for polynomial.')
-        for monomial in self.monomials:
+        for monomial in self.terms.values():
             if monomial.coefficient != 0:
-                monomialIndex = other.find_monomial(monomial)
-                if monomialIndex == -1:
+                otherMonomial = other.get_monomial(monomial)
+                if otherMonomial is None:
                     return False
-                otherMonomial = other.monomials[monomialIndex]
                 difference = otherMonomial.coefficient - monomial.coefficient
                 if abs(difference) > epsilon:
                     return False
         return True
 
+    @measure('compare_by_epsilon')
     def compare_by_epsilon(self, other, epsilon: float) -> bool:
+        """
+        Walks terms of both polynomials sorted by signatures at once.
+        Terms present in one polynomial only are never equal, except
+        for the constant term that is compared to zero if the other
+        polynomial has it.
+        """
         if not isinstance(other, Polynomial):
             raise TypeError('Polynomial can be compared only to polynomial.')
-        return self.is_sub_polynomial(other, epsilon)\
-            and other.is_sub_polynomial(self, epsilon)
+        first = self.ordered_terms()
+        second = other.ordered_terms()
+        index = 0
+        otherIndex = 0
+        while index < len(first) or otherIndex < len(second):
+            if otherIndex == len(second) or index < len(first) and \
+                    first[index][0] > second[otherIndex][0]:
+                signature, coefficient = first[index]
+                index += 1
+                if not other.has_zero_term(signature, coefficient, epsilon):
+                    return False
+            elif index == len(first) or \
+                    first[index][0] < second[otherIndex][0]:
+                signature, coefficient = second[otherIndex]
+                otherIndex += 1
+                if not self.has_zero_term(signature, coefficient, epsilon):
+                    return False
+            else:
+                difference = first[index][1] - second[otherIndex][1]
+                index += 1
+                otherIndex += 1
+                if abs(difference) > epsilon:
+                    return False
+        return True
+
+    def has_zero_term(self, signature: tuple, coefficient,
+                      epsilon: float) -> bool:
+        """
+        Checks if the term with given signature is zero
+        and differs from coefficient by epsilon at most.
+        """
+        existing = self.terms.get(signature)
+        return existing is not None and \
+            not abs(existing.coefficient - coefficient) > epsilon
+
+    def ordered_terms(self, order: str = None) -> tuple:
+        """
+        Nonzero terms as (signature, coefficient) pairs sorted by
+        decreasing monomial order, or by decreasing signatures if order
+        is None. Tuples are cached until terms are changed.
+        """
+        terms = self.cached.get(order)
+        if terms is None:
+            if order is None:
+                key = itemgetter(0)
+            else:
+                orderKey = MONOMIAL_ORDERS[order]
+
+                def key(term: tuple) -> tuple:
+                    return orderKey(term[0])
+            terms = tuple(sorted(
+                ((signature, monomial.coefficient)
+                 for signature, monomial in self.terms.items()
+                 if monomial.coefficient != 0),
+                key=key, reverse=True))
+            self.cached[order] = terms
+        return terms
+
+    def normal_form(self, order: str = 'lex') -> list:
+        """
+        Canonical normal form: nonzero terms as (signature, coefficient)
+        pairs sorted by decreasing lex or grevlex monomial order,
+        the leading term is the first one.
+        """
+        if order not in MONOMIAL_ORDERS:
+            raise ValueError('Unknown monomial order: {0}.'.format(order))
+        return list(self.ordered_terms(order))
+
+    def compile(self):
+        """
+        Returns function evaluating the polynomial by multivariate
+        Horner scheme, values of variables are passed in alphabetical
+        order or by name. Variable "j" stored as "i" is named "j" again.
+        The function is cached until terms are changed.
+        """
+        function = self.cached.get('compiled')
+        if function is None:
+            zero = self.terms.get(())
+            function = compile_terms(
+                [(tuple((swap(variable, 'i', 'j'), exponent)
+                        for variable, exponent in signature), coefficient)
+                 for signature, coefficient in self.ordered_terms()],
+                0 if zero is None else zero.coefficient)
+            self.cached['compiled'] = function
+        return function
 
     def __eq__(self, other) -> bool:
         return self.compare_by_epsilon(other, 0)
 
+    def __hash__(self) -> int:
+        # Zero terms are ignored by comparison, equal numbers
+        # of different types have equal hashes.
+        return hash(frozenset(
+            (signature, monomial.coefficient)
+            for signature, monomial in self.terms.items()
+            if monomial.coefficient != 0))
+
+    def canonical_terms(self) -> list:
+        """
+        Sorted list of nonzero terms, equal polynomials
+        have equal lists whatever the order of terms is.
+        """
+        return sorted(
+            (signature, canonical_number(monomial.coefficient))
+            for signature, monomial in self.terms.items()
+            if monomial.coefficient != 0)
+
+    def fingerprint(self) -> str:
+        """
+        Digest of canonical terms, it is stable between runs,
+        so it can be stored.
+        """
+        return sha256(repr(self.canonical_terms()).encode('utf-8')) \
+            .hexdigest()
+
     def __add__(self, other):
-        new = deepcopy(self)
+        new = self.copy()
+        new += other
+        return new
+
+    def __iadd__(self, other):
+        if self.frozen:
+            return self + other
         if isinstance(other, Monomial):
-            monomialIndex = self.find_monomial(other)
-            if monomialIndex == -1:
-                new.monomials.append(other)
-            else:
-                new.monomials[monomialIndex] += other
+            self.add_term(other.signature, other.coefficient)
         elif isinstance(other, Polynomial):
-            for monomial in other.monomials:
-                new += monomial
+            for signature, monomial in other.terms.items():
+                self.add_term(signature, monomial.coefficient)
         else:
             raise TypeError(
                 'Only monomial or polynomial can be added to polynomial.')
-        return new
+        return self
 
     def __mul__(self, other):
-        if isinstance(other, Monomial) or isinstance(other, Polynomial):
-            summary = Polynomial(None)
-            for monomial in self.monomials:
-                summary += (monomial * other)
-            return summary
+        if isinstance(other, Monomial):
+            otherTerms = {other.signature: other}
+        elif isinstance(other, Polynomial):
+            if len(self.terms) * len(other.terms) >= DENSE_THRESHOLD:
+                # Dense module imports this one and numpy,
+                # so it is imported only for large products.
+                from math_methods import dense
+                product = dense.multiply(self, other)
+                if product is not None:
+                    return product
+            otherTerms = other.terms
         else:
             raise TypeError(
                 'Polynomial can be multiplied only by polynomial or monomial.')
+        check_budget()
+        product = Polynomial(None)
+        terms = multiply_terms(self.terms, otherTerms)
+        if terms is not None:
+            check_budget(len(terms))
+            for signature, coefficient in terms:
+                product.add_term(signature, coefficient)
+            return product
+        for signature, monomial in self.terms.items():
+            for otherSignature, otherMonomial in otherTerms.items():
+                product.add_product(
+                    signature, otherSignature,
+                    monomial.coefficient * otherMonomial.coefficient)
+            check_budget(len(product.terms))
+        return product
+
+    def iterate_product(self, other):
+        """
+        Lazily generates nonzero terms of the product with polynomial
+        or monomial as (signature, coefficient) pairs sorted
+        lexicographically, the product itself is never built.
+        """
+        if isinstance(other, Monomial):
+            otherTerms = {other.signature: other}
+        elif isinstance(other, Polynomial):
+            otherTerms = other.terms
+        else:
+            raise TypeError(
+                'Polynomial can be multiplied only by polynomial or monomial.')
+        return iterate_product(self.terms, otherTerms)
+
+    def __imul__(self, other):
+        if self.frozen:
+            return self * other
+        self.terms = (self * other).terms
+        return self
 
 
 class Monomial:
+    """
+    Class represents monomial as a coefficient and a signature
+    of its variable part. Signatures are interned, so equal variable
+    parts of all monomials share one tuple, and monomials
+    have no per-instance dictionaries.
+    """
+    __slots__ = ('coefficient', 'signature')
+
     def __init__(self, string: str):
         self.coefficient = None
-        self.variables = None
+        self.signature = ()
         if string is not None:
             string = re.sub('[a-ik-z]', '(\g<0>)', string)
             lexemes = parsing.cut_composition_lexemes(string)
@@ -126,24 +414,58 @@ class Monomial:
                     variables[evaluatedLexeme] = evaluatedExponent
 
             self.coefficient = coefficient
-            self.variables = variables
-            if self.coefficient == 0.0:
-                self.variables = {}
+            if self.coefficient != 0.0:
+                self.variables = variables
+
+    @property
+    def variables(self):
+        """
+        Read-only mapping from variables to their exponents.
+        """
+        return MappingProxyType(dict(self.signature))
+
+    @variables.setter
+    def variables(self, variables: dict) -> None:
+        self.signature = intern_signature(tuple(sorted(variables.items())))
+
+    def __hash__(self) -> int:
+        return hash(self.signature)
 
     def __eq__(self, other) -> bool:
-        # Two monomials are equal if their variable part are equals
-        # Only keys (strs) and values (ints) will be compared.
+        # Two monomials are equal if their variable parts are equal.
         if not isinstance(other, Monomial):
             raise TypeError('Monomial can be compared only with monomial.')
-        return other.variables == self.variables
+        return other.signature == self.signature
+
+    @staticmethod
+    def from_signature(signature: tuple, coefficient):
+        """
+        Creates monomial from signature and coefficient
+        without parsing anything.
+        """
+        new = Monomial(None)
+        new.coefficient = coefficient
+        if coefficient != 0.0:
+            new.signature = intern_signature(signature)
+        return new
+
+    def copy(self):
+        new = Monomial(None)
+        new.coefficient = self.coefficient
+        new.signature = self.signature
+        return new
+
+    def freeze(self) -> None:
+        """
+        Makes monomial immutable in place.
+        """
+        self.__class__ = FrozenMonomial
 
     def __add__(self, other):
         if isinstance(other, Monomial):
             if other == self:
-                new = deepcopy(self)
-                new.coefficient += other.coefficient
-                if new.coefficient == 0.0:
-                    return Monomial('0')
+                new = self.copy()
+                new += other
                 return new
             summary = Polynomial(None)
             summary.monomials = [self, other]
@@ -153,23 +475,62 @@ class Monomial:
         raise TypeError(
             'Monomial can be added only to monomial or polynomial.')
 
+    def __iadd__(self, other):
+        if isinstance(other, Monomial) and other == self:
+            self.coefficient += other.coefficient
+            if self.coefficient == 0.0:
+                self.signature = ()
+            return self
+        return self + other
+
     def __mul__(self, other):
         if isinstance(other, Monomial):
-            new = deepcopy(self)
-            new.coefficient *= other.coefficient
-            if new.coefficient == 0.0:
-                return Monomial('0')
-            for variable in other.variables:
-                if variable in self.variables:
-                    new.variables[variable] += other.variables[variable]
-                else:
-                    new.variables[variable] = other.variables[variable]
+            new = self.copy()
+            new *= other
             return new
         elif isinstance(other, Polynomial):
             return other * self
         raise TypeError(
             'Monomial can be multiplied only by monomial or polynomial.')
 
+    def __imul__(self, other):
+        if isinstance(other, Monomial):
+            self.coefficient *= other.coefficient
+            if self.coefficient == 0.0:
+                self.signature = ()
+                return self
+            self.signature = intern_signature(
+                multiply_signatures(self.signature, other.signature))
+            return self
+        return self * other
+
+
+class FrozenMonomial(Monomial):
+    """
+    Monomial of a frozen polynomial, in place operators
+    return new monomials.
+    """
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value) -> None:
+        raise TypeError('Frozen monomial can not be changed.')
+
+    def __iadd__(self, other):
+        return self + other
+
+    def __imul__(self, other):
+        return self * other
+
+
+@measure('parse_composition')
+def parse_slicing(string: str):
+    """
+    Parses normalized expression by the slicing parser. Its recursive
+    steps are measured as a single stage here, so they don't take
+    extra stack frames of measurement per nesting level.
+    """
+    return parse_composition(parsing.normalize_expression(string))
+
 
 def parse_composition(string: str):
     if parsing.check_monomial(string):
@@ -211,27 +572,327 @@ def parse_composition(string: str):
     return composition
 
 
+# Sums with at most this number of terms are raised to a power
+# by generating multinomial expansion directly.
+MULTINOMIAL_TERMS_LIMIT = 4
+
+
+@measure('compose')
 def compose(lexeme, exponent: int):
-    if exponent >= 2:
-        startLexeme = deepcopy(lexeme)
-        for counter in range(exponent - 1):
-            lexeme *= startLexeme
-    return lexeme
+    """
+    Raises monomial or polynomial to natural exponent.
+    """
+    if exponent < 2:
+        return lexeme
+    if isinstance(lexeme, Monomial):
+        if type(lexeme.coefficient) is not int:
+            return raise_by_multiplication(lexeme, exponent)
+        return raise_monomial(lexeme.signature, lexeme.coefficient, exponent)
+    terms = [(signature, monomial.coefficient)
+             for signature, monomial in lexeme.terms.items()
+             if monomial.coefficient != 0]
+    if len(terms) == 0:
+        return lexeme
+    if any(type(coefficient) is not int for _, coefficient in terms):
+        # Order of floating point operations changes rounding,
+        # so inexact coefficients are multiplied in the order
+        # of the written repeated product.
+        return raise_by_multiplication(lexeme, exponent)
+    if len(terms) == 1:
+        result = Polynomial(None)
+        result.insert_monomial(
+            raise_monomial(terms[0][0], terms[0][1], exponent))
+        return result
+    check_budget()
+    if len(terms) <= MULTINOMIAL_TERMS_LIMIT:
+        return raise_by_multinomial(terms, exponent)
+    return raise_by_squaring(lexeme, exponent)
+
+
+def raise_by_multiplication(lexeme, exponent: int):
+    """
+    Raises monomial or polynomial to natural exponent
+    by multiplying it exponent - 1 times from left to right.
+    """
+    result = lexeme.copy()
+    for _ in range(exponent - 1):
+        check_budget()
+        result *= lexeme
+    return result
+
+
+def raise_monomial(signature: tuple, coefficient, exponent: int):
+    """
+    Raising monomial only scales its exponents and coefficient.
+    """
+    check_power(coefficient, exponent)
+    return Monomial.from_signature(power_signature(signature, exponent),
+                                   coefficient ** exponent)
+
+
+def raise_by_multinomial(terms: list, exponent: int):
+    """
+    Generates every term of multinomial expansion of a short sum
+    given as a list of (signature, coefficient) pairs.
+    """
+    factorials = [1]
+    for number in range(1, exponent + 1):
+        factorials.append(factorials[-1] * number)
+        check_budget()
+    powers = [[(power_signature(signature, power), coefficient ** power)
+               for power in range(exponent + 1)]
+              for signature, coefficient in terms]
+    result = Polynomial(None)
+    last = len(terms) - 1
+
+    def expand(index: int, remaining: int, signature: tuple,
+               coefficient, denominator: int) -> None:
+        if index == last:
+            powerSignature, powerCoefficient = powers[index][remaining]
+            multinomial = factorials[exponent] // (
+                denominator * factorials[remaining])
+            result.add_term(multiply_signatures(signature, powerSignature),
+                            multinomial * coefficient * powerCoefficient)
+            return
+        if index == 0:
+            check_budget(len(result.terms))
+        for power in range(remaining + 1):
+            powerSignature, powerCoefficient = powers[index][power]
+            expand(index + 1, remaining - power,
+                   multiply_signatures(signature, powerSignature),
+                   coefficient * powerCoefficient,
+                   denominator * factorials[power])
+
+    expand(0, exponent, (), 1, 1)
+    return result
+
+
+def raise_by_squaring(lexeme, exponent: int):
+    """
+    Raises polynomial to natural exponent using
+    O(log(exponent)) multiplications.
+    """
+    result = None
+    while True:
+        if exponent & 1:
+            result = lexeme.copy() if result is None else result * lexeme
+        exponent >>= 1
+        if exponent == 0:
+            return result
+        check_budget(len(lexeme.terms))
+        lexeme = lexeme * lexeme
 
 
 def parse_sum(string: str):
     if not parsing.check_sum(string):
         return parse_composition(string)
     lexemes = parsing.cut_sum_lexemes(string)
-    summary = None
+    summary = Polynomial(None)
 
     for lexeme in lexemes:
         if parsing.check_monomial(lexeme):
-            evaluated = Monomial(lexeme)
+            summary += Monomial(lexeme)
         else:
-            evaluated = parse_composition(lexeme)
-        if summary is None:
-            summary = evaluated
-        else:
-            summary += evaluated
+            summary += parse_composition(lexeme)
     return summary
+
+
+# Expansions of shared subexpressions with at most this number
+# of terms in total are kept, least recently used ones are dropped.
+EXPANSIONS_TERMS_LIMIT = 1 << 16
+
+
+class Expansions:
+    """
+    Least recently used expansions of shared subexpressions keyed
+    by their nodes. Memory they hold is bounded by the total number
+    of their terms, a number counts as a single term.
+    """
+    def __init__(self, max_terms: int) -> None:
+        self.max_terms = max_terms
+        self.entries = OrderedDict()
+        self.terms = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, node) -> bool:
+        return node in self.entries
+
+    def __getitem__(self, node):
+        return self.entries[node]
+
+    def get(self, node):
+        """
+        Returns expansion of node or None if it is not kept.
+        """
+        result = self.entries.get(node)
+        if result is not None:
+            self.entries.move_to_end(node)
+        return result
+
+    def put(self, node, result) -> None:
+        """
+        Keeps expansion of node, expansions larger than
+        the limit are not kept at all.
+        """
+        size = count_terms(result)
+        if size > self.max_terms:
+            return
+        self.entries[node] = result
+        self.terms += size
+        while self.terms > self.max_terms:
+            _, dropped = self.entries.popitem(last=False)
+            self.terms -= count_terms(dropped)
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.terms = 0
+
+
+def count_terms(result) -> int:
+    return len(result.terms) if isinstance(result, Polynomial) else 1
+
+
+expansions = Expansions(EXPANSIONS_TERMS_LIMIT)
+
+
+@measure('expand_tree')
+def expand_tree(node):
+    """
+    Expands expression tree into a polynomial.
+    Subtrees without variables are evaluated to numbers.
+    The whole tree is not kept among shared expansions,
+    so the caller owns the only copy of the result.
+    """
+    result = expressions.run_nested(expand_node(node))
+    if isinstance(result, Polynomial):
+        check_budget(len(result.terms))
+        if result.frozen:
+            result = result.copy()
+    return result
+
+
+def expand_shared(node):
+    """
+    Generator expanding shared node of expression tree run
+    by run_nested, subexpressions repeated in the tree or in expressions
+    parsed before are expanded once. Resulting polynomials are frozen,
+    they are copied before changes in place.
+    """
+    if node.arithmetic or node.operator == expressions.VARIABLE:
+        return (yield expand_node(node))
+    result = expansions.get(node)
+    if result is not None:
+        return result
+    result = yield expand_node(node)
+    if isinstance(result, Polynomial):
+        check_budget(len(result.terms))
+        result.freeze()
+    expansions.put(node, result)
+    return result
+
+
+def expand_node(node):
+    """
+    Generator expanding a single node, its operands
+    are shared expansions expanded as nested steps.
+    """
+    if node.arithmetic:
+        return expressions.evaluate_tree(node)
+    operator = node.operator
+    if operator == expressions.VARIABLE:
+        result = Polynomial(None)
+        result.add_term(((node.value, 1),), 1)
+        return result
+    if operator == expressions.SUM:
+        result = Polynomial(None)
+        for operand in node.operands:
+            negative = operand.operator == expressions.NEGATION
+            value = yield expand_shared(
+                operand.operands[0] if negative else operand)
+            if not isinstance(value, Polynomial):
+                result.add_term((), -value if negative else value)
+            elif negative:
+                for signature, monomial in value.terms.items():
+                    result.add_term(signature, -monomial.coefficient)
+            else:
+                result += value
+        return result
+    if operator == expressions.PRODUCT:
+        factor = None
+        result = None
+        for operand in node.operands:
+            if operand.operator == expressions.RECIPROCAL:
+                value = yield expand_shared(operand.operands[0])
+                if isinstance(value, Polynomial):
+                    raise ValueError('Rational function found.')
+                factor = (1 if factor is None else factor) / value
+                continue
+            value = yield expand_shared(operand)
+            if not isinstance(value, Polynomial):
+                factor = value if factor is None else factor * value
+            elif result is None:
+                result = value
+            else:
+                result *= value
+        if result is None:
+            return factor
+        if factor is not None and not (factor == 1 and
+                                       isinstance(factor, int)):
+            if result.frozen:
+                result = result.copy()
+            result.scale(factor)
+        return result
+    if operator == expressions.POWER:
+        base, exponent = node.operands
+        if not exponent.arithmetic:
+            raise ValueError('Exponent function found.')
+        exponent = natural_exponent(expressions.evaluate_tree(exponent))
+        if exponent == 0:
+            return 1
+        base = yield expand_shared(base)
+        if not isinstance(base, Polynomial):
+            return base ** exponent
+        return compose(base, exponent)
+    if operator == expressions.NEGATION:
+        result = yield expand_shared(node.operands[0])
+        if not isinstance(result, Polynomial):
+            return -result
+        if result.frozen:
+            result = result.copy()
+        result.scale(-1)
+        return result
+    raise ValueError('Rational function found.')
+
+
+def canonical_number(number) -> tuple:
+    """
+    Represents number as a pair of real and imaginary parts,
+    integral floats are converted to integers, so equal numbers
+    have equal representations.
+    """
+    parts = []
+    for part in (number.real, number.imag):
+        if isinstance(part, float) and isfinite(part) and part == trunc(part):
+            part = trunc(part)
+        parts.append(part)
+    return tuple(parts)
+
+
+def natural_exponent(exponent) -> int:
+    """
+    Converts exponent of a variable to natural number
+    if it is close enough to one.
+    """
+    if isinstance(exponent, complex):
+        if abs(exponent.imag) >= 10**-15:
+            raise ValueError('Complex exponent function found.')
+        exponent = exponent.real
+    if isinstance(exponent, float):
+        if abs(exponent - trunc(exponent)) >= 10**-15:
+            raise ValueError('Irrational function found.')
+        exponent = round(exponent)
+    if exponent < 0:
+        raise ValueError('Rational function found.')
+    return exponent
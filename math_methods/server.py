@@ -0,0 +1,243 @@
+import asyncio
+import ipaddress
+import json
+import os
+import socket
+import stat
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from math import isfinite
+from os import path, remove
+
+from math_methods import batch
+from math_methods.budget import Budget
+from math_methods.client import MAX_REQUEST_BYTES, parse_address
+
+# Workers get this much time to stop by the budget
+# after request timeout before the request is abandoned.
+TIMEOUT_GRACE = 1.0
+# Exit code of requests abandoned after timeout,
+# it is the exit code of exceeded budgets.
+TIMEOUT_EXIT_CODE = batch.BUDGET_EXIT_CODE
+
+
+def is_number(value) -> bool:
+    return isinstance(value, (int, float)) and \
+        not isinstance(value, bool) and isfinite(value)
+
+
+def check_request(request: dict) -> None:
+    """
+    Raises ValueError if request is incorrect, so workers
+    get only requests they can run.
+    """
+    kind = request.get('kind', 'compare')
+    if kind == 'compare':
+        pair = request.get('pair')
+        if not isinstance(pair, list) or len(pair) != 2 or \
+                not all(isinstance(string, str) for string in pair):
+            raise ValueError('Pair must be a list of two expressions.')
+        epsilon = request.get('epsilon')
+        if epsilon is not None and not (is_number(epsilon) and
+                                        epsilon >= 0):
+            raise ValueError('Epsilon must be a non-negative number.')
+        probability = request.get('probability')
+        if probability is not None and not (is_number(probability) and
+                                            0 < probability < 1):
+            raise ValueError('Probability must be between 0 and 1.')
+    elif kind == 'check':
+        if not isinstance(request.get('expression'), str):
+            raise ValueError('Expression must be a string.')
+    else:
+        raise ValueError('Unknown request kind: {0}.'.format(kind))
+
+
+def handle_request(request: dict, cache_size: int = 0,
+                   store_path: str = None, budget: Budget = None) -> dict:
+    """
+    Runs request in worker process. Comparison requests have
+    a pair of expressions and optional epsilon or probability
+    of randomized comparison, check requests have an expression.
+    """
+    check_request(request)
+    batch.open_worker(cache_size, store_path)
+    specific = bool(request.get('specific', False))
+    if request.get('kind', 'compare') == 'compare':
+        return batch.compare_pair(
+            tuple(request['pair']), request.get('epsilon'), specific,
+            batch.workerCache, batch.workerStore,
+            request.get('probability'), budget)
+    return batch.describe_expression(
+        request['expression'], specific, batch.workerCache,
+        batch.workerStore, budget)
+
+
+def is_socket(address: str) -> bool:
+    return path.exists(address) and stat.S_ISSOCK(os.stat(address).st_mode)
+
+
+def check_host(host: str, port: int) -> None:
+    """
+    Raises ValueError unless every address of the host is a loopback
+    one, the server has no authentication, so it is local only.
+    """
+    try:
+        addresses = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except OSError as exception:
+        raise ValueError('Host {0} is not found: {1}.'.format(
+            host, exception))
+    for address in addresses:
+        if not ipaddress.ip_address(
+                address[4][0].split('%')[0]).is_loopback:
+            raise ValueError('Host {0} is not a loopback one.'.format(host))
+
+
+class Server:
+    """
+    Keeps the library loaded in a pool of worker processes
+    and answers JSON Lines requests of local clients. Requests
+    of one connection are run concurrently, responses have the id
+    of their request. Requests are limited by the budget, timeout
+    of the request is its time budget. Requests of closed connections
+    are cancelled unless workers have started them. Broken pool
+    of worker processes is replaced by a new one.
+    """
+    def __init__(self, jobs: int = 1, budget: Budget = None,
+                 cache_size: int = 0, store_path: str = None) -> None:
+        if jobs < 1:
+            raise ValueError('Number of jobs must be positive.')
+        self.jobs = jobs
+        self.budget = budget or Budget()
+        self.cache_size = cache_size
+        self.store_path = store_path
+        self.executor = None
+
+    def request_budget(self, request: dict) -> Budget:
+        timeout = request.get('timeout', self.budget.max_seconds)
+        if timeout is not None and not (is_number(timeout) and timeout > 0):
+            raise ValueError('Timeout must be a positive number.')
+        return Budget(self.budget.max_terms, self.budget.max_degree,
+                      timeout)
+
+    async def respond(self, line: bytes) -> dict:
+        try:
+            request = json.loads(line.decode('utf-8'))
+            if not isinstance(request, dict):
+                raise ValueError('Request must be a JSON object.')
+            check_request(request)
+            budget = self.request_budget(request)
+        except ValueError as exception:
+            return {'error': 'BadRequest', 'exit_code': 2,
+                    'message': str(exception)}
+        response = None
+        loop = asyncio.get_running_loop()
+        executor = self.executor
+        try:
+            future = loop.run_in_executor(
+                executor, handle_request, request, self.cache_size,
+                self.store_path, budget)
+            timeout = budget.max_seconds
+            response = await asyncio.wait_for(
+                future, None if timeout is None else timeout + TIMEOUT_GRACE)
+        except asyncio.TimeoutError:
+            response = {'error': 'TimeoutError',
+                        'exit_code': TIMEOUT_EXIT_CODE,
+                        'message': 'Request takes more than {0} seconds.'
+                        .format(budget.max_seconds)}
+        except ValueError as exception:
+            response = {'error': 'BadRequest', 'exit_code': 2,
+                        'message': str(exception)}
+        except BrokenProcessPool as exception:
+            # A worker has crashed, the pool can't run requests
+            # any more. Requests sharing the pool replace it once.
+            if self.executor is executor:
+                self.executor = ProcessPoolExecutor(self.jobs)
+                executor.shutdown(wait=False)
+            response = {'error': type(exception).__name__, 'exit_code': 1,
+                        'message': str(exception)}
+        except Exception as exception:
+            # Unexpected errors must not stop the server.
+            response = {'error': type(exception).__name__, 'exit_code': 1,
+                        'message': str(exception)}
+        if 'id' in request:
+            response['id'] = request['id']
+        return response
+
+    async def answer(self, line: bytes, writer, lock, tasks: set) -> None:
+        response = await self.respond(line)
+        try:
+            async with lock:
+                writer.write(json.dumps(response, sort_keys=True)
+                             .encode('utf-8') + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            # Nobody waits for the other requests of the connection.
+            for task in tasks:
+                task.cancel()
+
+    async def handle_connection(self, reader, writer) -> None:
+        tasks = set()
+        lock = asyncio.Lock()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                task = asyncio.ensure_future(
+                    self.answer(line, writer, lock, tasks))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.wait(tasks)
+        except (ConnectionError, ValueError):
+            # Client is gone or sent too long line,
+            # its requests are not needed any more.
+            for task in tasks:
+                task.cancel()
+        finally:
+            writer.close()
+
+    async def serve(self, address: str) -> None:
+        """
+        Serves requests at the address until the task is cancelled.
+        TCP sockets are served at loopback hosts only.
+        """
+        host, port = parse_address(address)
+        if port is not None:
+            check_host(host, port)
+        elif path.exists(host):
+            # Only a socket left by a previous server is replaced.
+            if not is_socket(host):
+                raise FileExistsError('{0} is not a socket.'.format(host))
+            remove(host)
+        self.executor = ProcessPoolExecutor(self.jobs)
+        try:
+            if port is None:
+                server = await asyncio.start_unix_server(
+                    self.handle_connection, host, limit=MAX_REQUEST_BYTES)
+            else:
+                server = await asyncio.start_server(
+                    self.handle_connection, host, port,
+                    limit=MAX_REQUEST_BYTES)
+            try:
+                async with server:
+                    await server.serve_forever()
+            finally:
+                if port is None and is_socket(host):
+                    remove(host)
+        finally:
+            self.executor.shutdown()
+
+
+def serve(address: str, jobs: int = 1, budget: Budget = None,
+          cache_size: int = 0, store_path: str = None) -> None:
+    """
+    Runs the server until it is interrupted.
+    """
+    try:
+        asyncio.run(Server(jobs, budget, cache_size, store_path)
+                    .serve(address))
+    except KeyboardInterrupt:
+        pass
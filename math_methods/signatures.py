@@ -0,0 +1,87 @@
+from functools import lru_cache
+from sys import intern
+
+# Signature is a hashable canonical form of monomial's variable part:
+# a tuple of (variable, exponent) pairs sorted by variable.
+
+# Interned signatures and their pairs are shared by all monomials,
+# the table is cleared when it reaches this size.
+INTERNED_LIMIT = 1 << 20
+interned = {}
+
+
+def intern_signature(signature: tuple) -> tuple:
+    """
+    Returns the shared signature equal to the given one,
+    new signatures are built of shared pairs with interned variables.
+    """
+    shared = interned.get(signature)
+    if shared is not None:
+        return shared
+    if len(interned) >= INTERNED_LIMIT:
+        interned.clear()
+    pairs = []
+    for pair in signature:
+        sharedPair = interned.get(pair)
+        if sharedPair is None:
+            variable, exponent = pair
+            sharedPair = interned[pair] = (intern(variable), exponent)
+        pairs.append(sharedPair)
+    shared = interned[signature] = tuple(pairs)
+    return shared
+
+
+def multiply_signatures(first: tuple, second: tuple) -> tuple:
+    """
+    Returns the signature of product of monomials with given signatures.
+    """
+    if not first:
+        return second
+    if not second:
+        return first
+    variables = dict(first)
+    for variable, exponent in second:
+        variables[variable] = variables.get(variable, 0) + exponent
+    return tuple(sorted(variables.items()))
+
+
+def power_signature(signature: tuple, exponent: int) -> tuple:
+    """
+    Returns the signature of monomial raised to natural exponent.
+    """
+    if exponent == 0:
+        return ()
+    return tuple((variable, power * exponent)
+                 for variable, power in signature)
+
+
+@lru_cache(maxsize=None)
+def inverted(variable: str) -> tuple:
+    """
+    Key ordering variables in reverse alphabetical order.
+    """
+    return tuple(-ord(symbol) for symbol in variable) + (1,)
+
+
+def lex_key(signature: tuple) -> tuple:
+    """
+    Key of lexicographic monomial order with variables ordered
+    alphabetically: the first variable with different exponents
+    decides, the higher exponent is the greater monomial.
+    """
+    return tuple((inverted(variable), exponent)
+                 for variable, exponent in signature)
+
+
+def grevlex_key(signature: tuple) -> tuple:
+    """
+    Key of graded reverse lexicographic monomial order: the higher
+    total degree is the greater monomial, ties are decided by the last
+    variable with different exponents, the lower exponent is greater.
+    """
+    return (sum(exponent for _, exponent in signature),
+            tuple((inverted(variable), -exponent)
+                  for variable, exponent in reversed(signature)))
+
+
+MONOMIAL_ORDERS = {'lex': lex_key, 'grevlex': grevlex_key}
@@ -0,0 +1,125 @@
+import tracemalloc
+from functools import wraps
+from time import perf_counter
+
+# Collector active in this process, stages are measured only
+# while there is one, otherwise measured functions are called directly.
+current = None
+
+
+class Stats:
+    """
+    Collects wall time, number of calls, peak traced memory in bytes
+    and number of terms of resulting polynomials of every stage.
+    Time of recursive calls of a stage is counted once.
+    Memory is traced only if memory is set, tracing slows
+    all allocations down.
+    """
+    def __init__(self, memory: bool = False) -> None:
+        self.memory = memory
+        self.stages = {}
+        self.frames = []
+        self.previous = None
+        self.tracing = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exception) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        global current
+        self.previous = current
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.tracing = True
+        current = self
+
+    def stop(self) -> None:
+        global current
+        current = self.previous
+        self.previous = None
+        if self.tracing:
+            tracemalloc.stop()
+            self.tracing = False
+
+    def report(self) -> dict:
+        """
+        Returns collected numbers as a mapping from stage names
+        to mappings of calls, seconds, terms and peak memory.
+        """
+        return {name: dict(stage) for name, stage in self.stages.items()}
+
+    def open_stage(self, name: str) -> list:
+        """
+        Counts the call and starts measuring the stage, returns
+        the frame of measurement or None for recursive calls.
+        """
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = {'calls': 0, 'seconds': 0.0,
+                                         'terms': 0}
+            if self.memory:
+                stage['peak_memory'] = 0
+        stage['calls'] += 1
+        if any(frame[0] == name for frame in self.frames):
+            return None
+        frame = [name, perf_counter(), 0, 0]
+        if self.memory and tracemalloc.is_tracing():
+            size, peak = tracemalloc.get_traced_memory()
+            if self.frames:
+                self.frames[-1][3] = max(self.frames[-1][3], peak)
+            reset_peak()
+            frame[2] = frame[3] = size
+        self.frames.append(frame)
+        return frame
+
+    def close_stage(self, name: str, frame: list, result) -> None:
+        """
+        Adds time, memory and terms of result to the stage.
+        """
+        if frame is None:
+            return
+        stage = self.stages[name]
+        terms = getattr(result, 'terms', None)
+        if terms is not None:
+            stage['terms'] += len(terms)
+        self.frames.pop()
+        stage['seconds'] += perf_counter() - frame[1]
+        if self.memory and tracemalloc.is_tracing():
+            peak = max(frame[3], tracemalloc.get_traced_memory()[1])
+            stage['peak_memory'] = max(stage['peak_memory'],
+                                       peak - frame[2])
+            if self.frames:
+                self.frames[-1][3] = max(self.frames[-1][3], peak)
+            reset_peak()
+
+
+def reset_peak() -> None:
+    # Peaks of stages are measured from their start
+    # where tracemalloc can reset the peak.
+    if hasattr(tracemalloc, 'reset_peak'):
+        tracemalloc.reset_peak()
+
+
+def measure(name: str):
+    """
+    Decorator measuring calls of function as the stage with given name.
+    """
+    def decorator(function):
+        @wraps(function)
+        def measured(*args, **kwargs):
+            stats = current
+            if stats is None:
+                return function(*args, **kwargs)
+            frame = stats.open_stage(name)
+            result = None
+            try:
+                result = function(*args, **kwargs)
+                return result
+            finally:
+                stats.close_stage(name, frame, result)
+        return measured
+    return decorator
@@ -0,0 +1,133 @@
+import json
+import sqlite3
+from hashlib import sha256
+from time import time
+
+from math_methods.parsing import normalize_expression
+from math_methods.polynomial import Polynomial
+from math_methods.validation import check_expression
+
+# Eviction runs once per this number of insertions.
+EVICTION_INTERVAL = 100
+
+
+def content_hash(*parts) -> str:
+    return sha256(json.dumps(parts).encode('utf-8')).hexdigest()
+
+
+def serialize(polynomial: Polynomial) -> str:
+    """
+    Converts polynomial to JSON, complex coefficients
+    are stored as pairs of real and imaginary parts.
+    """
+    terms = []
+    for signature, monomial in polynomial.terms.items():
+        coefficient = monomial.coefficient
+        if isinstance(coefficient, complex):
+            coefficient = [coefficient.real, coefficient.imag]
+        terms.append([signature, coefficient])
+    return json.dumps(terms)
+
+
+def deserialize(string: str) -> Polynomial:
+    polynomial = Polynomial(None)
+    for signature, coefficient in json.loads(string):
+        if isinstance(coefficient, list):
+            coefficient = complex(*coefficient)
+        polynomial.add_term(tuple(tuple(pair) for pair in signature),
+                            coefficient)
+    return polynomial
+
+
+class PolynomialStore:
+    """
+    Persistent SQLite store of expanded polynomials and comparison
+    records shared by runs and processes. Every process must open
+    its own store, least recently used entries are evicted
+    when there are more than max_entries in a table.
+    """
+    def __init__(self, path: str, max_entries: int = 100000,
+                 timeout: float = 30.0) -> None:
+        if max_entries < 1:
+            raise ValueError('Store size must be positive.')
+        self.max_entries = max_entries
+        self.insertions = 0
+        self.connection = sqlite3.connect(path, timeout=timeout,
+                                          isolation_level=None)
+        # Readers don't block the writer in write-ahead log mode.
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute(
+            'PRAGMA busy_timeout={0}'.format(int(timeout * 1000)))
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS expansions '
+            '(key TEXT PRIMARY KEY, terms TEXT NOT NULL, used REAL NOT NULL)')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS records '
+            '(key TEXT PRIMARY KEY, record TEXT NOT NULL, used REAL NOT NULL)')
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception) -> None:
+        self.close()
+
+    def load(self, table: str, key: str) -> str:
+        row = self.connection.execute(
+            'SELECT {0} FROM {1} WHERE key = ?'.format(
+                'terms' if table == 'expansions' else 'record', table),
+            (key,)).fetchone()
+        if row is None:
+            return None
+        self.connection.execute(
+            'UPDATE {0} SET used = ? WHERE key = ?'.format(table),
+            (time(), key))
+        return row[0]
+
+    def save(self, table: str, key: str, value: str) -> None:
+        self.connection.execute(
+            'INSERT OR REPLACE INTO {0} VALUES (?, ?, ?)'.format(table),
+            (key, value, time()))
+        self.insertions += 1
+        if self.insertions % EVICTION_INTERVAL == 0:
+            self.evict()
+
+    def evict(self) -> None:
+        for table in ['expansions', 'records']:
+            self.connection.execute(
+                'DELETE FROM {0} WHERE key IN (SELECT key FROM {0} ORDER BY '
+                'used DESC, rowid DESC LIMIT -1 OFFSET ?)'.format(table),
+                (self.max_entries,))
+
+    def get_polynomial(self, string: str) -> Polynomial:
+        """
+        Returns polynomial of expression, expression is parsed only
+        if there is no stored polynomial of the same normalized expression.
+        Errors are raised the same way Polynomial does it.
+        """
+        if not isinstance(string, str):
+            raise TypeError('Input must be string instance.')
+        check_expression(string)
+        key = content_hash(normalize_expression(string))
+        terms = self.load('expansions', key)
+        if terms is not None:
+            return deserialize(terms)
+        polynomial = Polynomial(string)
+        self.save('expansions', key, serialize(polynomial))
+        return polynomial
+
+    def get_record(self, pair: tuple, mode) -> dict:
+        """
+        Returns stored comparison record of expression pair
+        or None if the pair was not compared this way yet.
+        Mode is epsilon or any other JSON value describing comparison.
+        Expressions are not normalized, so nothing is parsed.
+        """
+        record = self.load('records', content_hash(pair, mode))
+        return None if record is None else json.loads(record)
+
+    def put_record(self, pair: tuple, mode, record: dict) -> None:
+        self.save('records', content_hash(pair, mode), json.dumps(record))
@@ -1,5 +1,7 @@
 import re
 
+from math_methods.stats import measure
+
 
 # These functions checks mathematical expression, except the last one.
 # Check tests for more information.
@@ -47,6 +49,7 @@ def find_trivial_rational_function(string: str):
     return re.finditer('([/:] *(?:[a-hj-z]|\( *[a-hj-z]+ *\)))', string)"""
 
 
+@measure('find_trivival_errors')
 def find_trivival_errors(string: str) -> str:
     """
     Uses all the functions above to check
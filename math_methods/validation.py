@@ -0,0 +1,208 @@
+from functools import lru_cache
+
+from math_methods import expressions
+from math_methods.complcated_errors import find_complicated_errors
+from math_methods.expressions import CLOSE, DIVIDE, MINUS, MULTIPLY, \
+    NUMBER, OPEN, PLUS, POWER, UNKNOWN, VARIABLE
+from math_methods.stats import measure
+from math_methods.trivial_errors import find_trivival_errors
+
+OPERATOR_KINDS = (PLUS, MINUS, MULTIPLY, DIVIDE, POWER)
+RUN_SYMBOLS = '0123456789i. '
+# Thresholds of the detailed checks with a margin for rounding.
+ZERO_DIVISOR = 10**-9
+ZERO_FOUNDATION = 10**-14
+
+
+def find_errors(string: str, tokens: list = None) -> str:
+    """
+    Checks mathematical expression in a single pass over its tokens.
+    Correct expressions are accepted without any other scan,
+    suspicious ones are described by detailed checks, so error
+    messages and positions are the same.
+    """
+    if tokens is None:
+        tokens = expressions.tokenize(string)
+    if is_suspicious(string, tokens):
+        return find_trivival_errors(string) or \
+            find_complicated_errors(string)
+
+
+@measure('check_expression')
+def check_expression(string: str, tokens: list = None) -> None:
+    """
+    Raises ValueError if expression is not a polynomial function
+    and SyntaxError if expression is incorrect.
+    """
+    errorMessage = find_errors(string, tokens)
+    if errorMessage is not None:
+        if 'function' in errorMessage:
+            raise ValueError(errorMessage)
+        raise SyntaxError(errorMessage)
+
+
+def is_suspicious(string: str, tokens: list) -> bool:
+    """
+    Looks for anything detailed checks may complain about.
+    False alarms are allowed, missed errors are not.
+    """
+    if not tokens:
+        return False
+    if tokens[0].kind in (MULTIPLY, DIVIDE, POWER) or \
+            tokens[-1].kind in OPERATOR_KINDS:
+        return True
+    pairs = {}
+    openings = []
+    # Number of variables before each token.
+    variables = [0]
+    previous = None
+    for index, token in enumerate(tokens):
+        kind = token.kind
+        if kind == UNKNOWN:
+            return True
+        if kind == OPEN:
+            openings.append(index)
+        elif kind == CLOSE:
+            if not openings or previous == OPEN or previous in OPERATOR_KINDS:
+                return True
+            opening = openings.pop()
+            pairs[opening] = index
+            pairs[index] = opening
+        elif kind == NUMBER:
+            if is_incorrect_number(string, token):
+                return True
+        elif kind in OPERATOR_KINDS:
+            if previous in OPERATOR_KINDS or \
+                    previous == OPEN and kind != PLUS and kind != MINUS:
+                return True
+            if kind == POWER and string[token.position + 1] != '*' and \
+                    string[token.position] == '*':
+                # "* *" is not a raise operator for detailed checks.
+                return True
+        variables.append(variables[-1] + (kind == VARIABLE))
+        previous = kind
+    if openings:
+        return True
+    for index, token in enumerate(tokens):
+        if token.kind == DIVIDE:
+            if is_suspicious_divisor(string, tokens, index + 1, pairs,
+                                     variables):
+                return True
+        elif token.kind == POWER:
+            if is_suspicious_power(string, tokens, index, pairs, variables):
+                return True
+    return False
+
+
+def is_incorrect_number(string: str, token) -> bool:
+    text = token.text
+    if '.' not in text:
+        return False
+    if text.count('.') > 1 or text[0] == '.' or text[-1] == '.':
+        return True
+    # Spaces around the point are removed by tokenizer.
+    position = token.position + text.index('.')
+    while string[position] not in '.,':
+        position += 1
+    return string[position - 1] == ' ' or string[position + 1] == ' '
+
+
+def find_operand(string: str, tokens: list, index: int, pairs: dict,
+                 left: bool):
+    """
+    Finds operand starting with the token at index the same way
+    detailed checks do. Returns the tokens of a bracket group,
+    the text of a run of numbers or None for a variable.
+    """
+    token = tokens[index]
+    if token.kind == VARIABLE:
+        return None
+    if token.kind == (CLOSE if left else OPEN):
+        if left:
+            return tokens[pairs[index]:index + 1]
+        return tokens[index:pairs[index] + 1]
+    if left:
+        end = tokens[index + 1].position
+        position = end - 1
+        while position >= 0 and string[position] in RUN_SYMBOLS:
+            position -= 1
+        return string[position + 1:end]
+    position = token.position
+    while position < len(string) and string[position] in RUN_SYMBOLS:
+        position += 1
+    return string[token.position:position]
+
+
+def evaluate_operand(operand):
+    if isinstance(operand, str):
+        return evaluate_run(operand)
+    return expressions.evaluate_tree(
+        expressions.Parser(operand, run_divisors=False).parse())
+
+
+@lru_cache(maxsize=4096)
+def evaluate_run(text: str):
+    """
+    Evaluates run of numbers and imaginary units, those repeat a lot.
+    """
+    return evaluate_operand(expressions.tokenize(text))
+
+
+def is_arithmetic(operand, variables: list, index: int) -> bool:
+    """
+    Checks if the operand starting with the token at index
+    doesn't contain variables.
+    """
+    if operand is None:
+        return False
+    if isinstance(operand, str):
+        return True
+    return variables[index + len(operand)] == variables[index]
+
+
+def is_followed_by_power(tokens: list, index: int, pairs: dict) -> bool:
+    """
+    Detailed checks extend bracket operands followed by a raise operator.
+    """
+    if tokens[index].kind != OPEN:
+        return False
+    end = pairs[index]
+    return end + 1 < len(tokens) and tokens[end + 1].kind == POWER
+
+
+def is_suspicious_divisor(string: str, tokens: list, index: int,
+                          pairs: dict, variables: list) -> bool:
+    if is_followed_by_power(tokens, index, pairs):
+        return True
+    operand = find_operand(string, tokens, index, pairs, False)
+    if not is_arithmetic(operand, variables, index):
+        return True
+    try:
+        return abs(evaluate_operand(operand)) < ZERO_DIVISOR
+    except Exception:
+        return True
+
+
+def is_suspicious_power(string: str, tokens: list, index: int,
+                        pairs: dict, variables: list) -> bool:
+    if is_followed_by_power(tokens, index + 1, pairs):
+        return True
+    exponent = find_operand(string, tokens, index + 1, pairs, False)
+    if not is_arithmetic(exponent, variables, index + 1):
+        return True
+    foundation = find_operand(string, tokens, index - 1, pairs, True)
+    try:
+        exponentValue = evaluate_operand(exponent)
+        if foundation is None or not isinstance(foundation, str) and \
+                variables[index] != variables[index - len(foundation)]:
+            if isinstance(exponentValue, complex):
+                if exponentValue.imag != 0:
+                    return True
+                exponentValue = exponentValue.real
+            return exponentValue < 0 or \
+                exponentValue != int(exponentValue)
+        foundationValue = evaluate_operand(foundation)
+        return abs(foundationValue) < ZERO_FOUNDATION and \
+            (isinstance(exponentValue, complex) or exponentValue < 0)
+    except Exception:
+        return True
@@ -0,0 +1,50 @@
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from math_methods.polynomial import Polynomial
+
+# Points are evaluated by chunks of this size, so temporary arrays
+# of the scheme take memory proportional to it, not to all points.
+CHUNK_POINTS = 1 << 16
+
+
+def evaluate_arrays(polynomial: Polynomial, values: dict,
+                    chunk_points: int = CHUNK_POINTS):
+    """
+    Evaluates polynomial at many points given as arrays or buffers
+    of values of variables of equal shape keyed by names. Compiled
+    Horner scheme of the polynomial is run on whole chunks of arrays,
+    powers of variables are computed once per chunk. Returns array
+    of the shape of arguments, complex if coefficients or values are.
+    """
+    if numpy is None:
+        raise ImportError('Evaluation of arrays requires numpy.')
+    if chunk_points < 1:
+        raise ValueError('Number of points in chunk must be positive.')
+    evaluate = polynomial.compile()
+    missing = set(evaluate.variables) - set(values)
+    if missing:
+        raise ValueError('Values of variables {0} are missing.'.format(
+            ', '.join(sorted(missing))))
+    arrays = {variable: numpy.asarray(array)
+              for variable, array in values.items()}
+    shapes = {array.shape for array in arrays.values()}
+    if len(shapes) > 1:
+        raise ValueError('Arrays of values must have the same shape.')
+    shape = shapes.pop() if shapes else ()
+    complexValued = any(array.dtype.kind == 'c'
+                        for array in arrays.values()) or \
+        any(isinstance(coefficient, complex)
+            for _, coefficient in polynomial.ordered_terms())
+    # Integer values are converted, so powers don't overflow.
+    dtype = numpy.complex128 if complexValued else numpy.float64
+    columns = [arrays[variable].astype(dtype, copy=False).reshape(-1)
+               for variable in evaluate.variables]
+    result = numpy.empty(shape, dtype=dtype)
+    flat = result.reshape(-1)
+    for start in range(0, flat.size, chunk_points):
+        flat[start:start + chunk_points] = evaluate(
+            *[column[start:start + chunk_points] for column in columns])
+    return result
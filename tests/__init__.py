@@ -1,2 +1,7 @@
-__all__ = ['complicated_error_check_tests', 'parsing_tests',
-           'polynomial_tests', 'trivial_error_check_tests']
+__all__ = ['batch_tests', 'budget_tests', 'cache_tests', 'clustering_tests',
+           'complicated_error_check_tests', 'dense_tests',
+           'expression_tests', 'identity_tests', 'multiplication_tests',
+           'packed_tests', 'parsing_tests', 'polynomial_tests',
+           'server_tests', 'stats_tests', 'store_tests',
+           'trivial_error_check_tests', 'validation_tests',
+           'vectorized_tests']
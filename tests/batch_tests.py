@@ -0,0 +1,66 @@
+import io
+import json
+import unittest
+import pathmagic
+from math_methods.batch import compare_pair, compare_pairs
+from math_methods.batch import compare_pairs_parallel, read_pairs
+from math_methods.batch import write_records
+
+
+class BatchTests(unittest.TestCase):
+    def test_read_pairs(self):
+        lines = iter(['x\n', '\n', 'y\n', 'z\n', '\n', 'w\n', '\n', 'v'])
+        self.assertEqual(list(read_pairs(lines)),
+                         [('x', 'y'), ('z', 'w'), ('v',)])
+
+    def test_compare_pair(self):
+        sets = [(('x+y', 'y+x'), 'equal', None, 0),
+                (('x', 'x+0.1'), 'not equal', None, 1),
+                (('x*/y', 'x'), None, 'SyntaxError', 3),
+                (('1/x', 'x'), None, 'ValueError', 4),
+                (('x', 'x/0'), None, 'SyntaxError', 5),
+                (('x', 'x^y'), None, 'ValueError', 6),
+                (('x',), None, 'MissingExpression', 1)]
+        for pair, verdict, error, code in sets:
+            record = compare_pair(pair, 10**-6)
+            self.assertEqual(record['verdict'], verdict)
+            self.assertEqual(record['error'], error)
+            self.assertEqual(record['exit_code'], code)
+            self.assertNotIn('message', record)
+        self.assertIn('message', compare_pair(('1/x', 'x'), specific=True))
+
+    def test_epsilon(self):
+        pair = ('x+1', 'x+1.001')
+        self.assertEqual(compare_pair(pair, 0.01)['exit_code'], 0)
+        self.assertEqual(compare_pair(pair, 10**-6)['exit_code'], 1)
+        self.assertEqual(compare_pair(pair)['exit_code'], 1)
+
+    def test_match_float_powers(self):
+        for base in ['0.1', '0.3', '0.7', '1.1', '2.3', '0.3i']:
+            for lexeme in ['({0}x+{0})', '({0}x)', '({0}x+{0}y-1)']:
+                lexeme = lexeme.format(base)
+                for exponent in range(2, 8):
+                    record = compare_pair(('{0}^{1}'.format(lexeme, exponent),
+                                           lexeme * exponent))
+                    self.assertEqual(record['verdict'], 'equal')
+
+    def test_write_records(self):
+        output = io.StringIO()
+        write_records(compare_pairs(iter([('x', 'x'), ('x', 'y')])), output)
+        records = [json.loads(line) for line in
+                   output.getvalue().splitlines()]
+        self.assertEqual([record['index'] for record in records], [0, 1])
+        self.assertEqual([record['exit_code'] for record in records], [0, 1])
+
+    def test_parallel(self):
+        pairs = [('(x+y)^{0}'.format(power), '(y+x)^{0}'.format(power))
+                 if power % 3 else ('x', '1/x') for power in range(40)]
+        expected = list(compare_pairs(pairs, 10**-6, True))
+        self.assertEqual(list(compare_pairs_parallel(
+            pairs, 2, 10**-6, True, chunk_size=3)), expected)
+        self.assertEqual([record['exit_code'] for record in expected[:4]],
+                         [6, 0, 0, 6])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+import pathmagic
+from math_methods import budget, expressions
+from math_methods.batch import compare_pair
+from math_methods.budget import Budget, BudgetExceededError
+from math_methods.polynomial import Polynomial
+
+
+class BudgetTests(unittest.TestCase):
+    def test_estimate_tree(self):
+        sets = [('x^5', (5, 1)), ('(x+y)^2*(x-y)', (3, 6)),
+                ('(x+y+z)^3', (3, 10)), ('(x+1)^0', (0, 1)),
+                ('2(3+i)^2', (0, 1)), ('(a+b+c+d+e+f)^200', (200, 2872408791))]
+        for string, estimation in sets:
+            self.assertEqual(
+                budget.estimate_tree(expressions.parse(string)), estimation)
+
+    def test_estimation_is_upper_bound(self):
+        strings = ['(x+y)^4*(x-y)^3', '(a+b+c)^5-(a-b)^2', '(x+y+1)^6/2']
+        for string in strings:
+            terms = len(Polynomial(string).terms)
+            self.assertLessEqual(
+                terms, budget.estimate_tree(expressions.parse(string))[1])
+
+    def test_limits(self):
+        with Budget(max_terms=100, max_degree=10):
+            self.assertEqual(Polynomial('(x+y)^3'),
+                             Polynomial('x^3+3x^2y+3xy^2+y^3'))
+            with self.assertRaises(BudgetExceededError):
+                Polynomial('(a+b+c+d+e+f)^200')
+            with self.assertRaises(BudgetExceededError):
+                Polynomial('x^11')
+        self.assertIsNone(budget.current)
+        self.assertEqual(len(Polynomial('(x+y)^11').terms), 12)
+        with self.assertRaises(ValueError):
+            Budget(max_terms=0)
+
+    def test_time_limit(self):
+        with Budget(max_seconds=10**-9):
+            with self.assertRaises(BudgetExceededError):
+                Polynomial('(x+y+z)^20*(x+y+z+w)^20')
+
+    def test_huge_numbers(self):
+        for expression in ['x*9^9^9', '(9x)^(9^9)', '9^9^9', 'x^(9^9^9)']:
+            with self.assertRaises(OverflowError):
+                Polynomial(expression)
+        with Budget(max_seconds=1):
+            with self.assertRaises(BudgetExceededError):
+                Polynomial('(x+1)^(9^9)')
+        self.assertEqual(Polynomial('2^3^2x'), Polynomial('512x'))
+
+    def test_exit_code(self):
+        limits = Budget(max_degree=50)
+        record = compare_pair(('x', '(x+y)^99'), budget=limits)
+        self.assertEqual(record['error'], 'BudgetExceededError')
+        self.assertEqual(record['expression'], 2)
+        self.assertEqual(record['exit_code'], 7)
+        record = compare_pair(('x^50', 'x^50'), budget=limits)
+        self.assertEqual(record['exit_code'], 0)
+        record = compare_pair(('x', 'x*9^9^9'))
+        self.assertEqual(record['error'], 'OverflowError')
+        self.assertEqual(record['expression'], 2)
+        self.assertEqual(record['exit_code'], 9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+import pathmagic
+from math_methods.cache import PolynomialCache
+from math_methods.polynomial import Monomial, Polynomial
+
+
+class CacheTests(unittest.TestCase):
+    def test_hits_and_misses(self):
+        cache = PolynomialCache(2)
+        first = cache.get('(x+y)^2')
+        self.assertIs(cache.get('( x + y )**2'), first)
+        self.assertEqual(first, Polynomial('x^2+2xy+y^2'))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_eviction(self):
+        cache = PolynomialCache(2)
+        first = cache.get('x')
+        cache.get('y')
+        cache.get('x')
+        cache.get('z')
+        self.assertEqual(len(cache), 2)
+        self.assertIs(cache.get('x'), first)
+        cache.get('y')
+        self.assertEqual((cache.hits, cache.misses), (2, 4))
+
+    def test_errors(self):
+        cache = PolynomialCache()
+        self.assertRaises(SyntaxError, cache.get, 'x* *+2')
+        self.assertRaises(ValueError, cache.get, '1/x')
+        self.assertRaises(TypeError, cache.get, 1)
+        self.assertRaises(ValueError, PolynomialCache, 0)
+        self.assertEqual(len(cache), 0)
+
+    def test_frozen_results(self):
+        cache = PolynomialCache()
+        cached = cache.get('x+y')
+        monomial = cached.get_monomial(Monomial('x'))
+        self.assertRaises(TypeError, cached.add_term, (), 1)
+        self.assertRaises(TypeError, cached.scale, 2)
+        self.assertRaises(TypeError, setattr, monomial, 'coefficient', 2)
+        with self.assertRaises(TypeError):
+            monomial.variables['x'] = 2
+        with self.assertRaises(TypeError):
+            cached.monomials = []
+        changed = cached
+        changed += Polynomial('x')
+        changed *= Polynomial('2')
+        self.assertEqual(changed, Polynomial('4x+2y'))
+        copy = cached.copy()
+        copy.scale(3)
+        self.assertEqual(cache.get('y+x'), Polynomial('x+y'))
+
+
+if __name__ == '__main__':
+    unittest.main()
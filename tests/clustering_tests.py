@@ -0,0 +1,47 @@
+import unittest
+import pathmagic
+from math_methods.clustering import Clusters, bucket_candidates
+from math_methods.clustering import cluster_expressions
+from math_methods.polynomial import Polynomial
+
+
+class ClusteringTests(unittest.TestCase):
+    def test_bucket_candidates(self):
+        self.assertEqual(bucket_candidates(Polynomial('0.8x+2'), 0.1),
+                         [(5, 0, 2, 0)])
+        self.assertEqual(bucket_candidates(Polynomial('0.65x'), 0.1),
+                         [(0, 0, 1, 0), (0, 0, 2, 0)])
+        terms = '+'.join('0.65x^{0}'.format(power) for power in range(7))
+        self.assertIsNone(bucket_candidates(Polynomial(terms), 0.1))
+
+    def test_exact_clusters(self):
+        clusters = Clusters()
+        expressions = ['(x+y)^2', 'x^2+2xy+y^2', 'x+y', 'y+x+0', '(x+y)^2']
+        self.assertEqual([clusters.add(Polynomial(expression))
+                          for expression in expressions], [0, 0, 1, 1, 0])
+
+    def test_epsilon_clusters(self):
+        clusters = Clusters(0.1)
+        expressions = ['0.39x', '0.41x', '0.47x', '0.6x', '0.41x+y', '0.5']
+        self.assertEqual([clusters.add(Polynomial(expression))
+                          for expression in expressions], [0, 0, 0, 1, 2, 3])
+
+    def test_zero_constant_term(self):
+        clusters = Clusters(10**-6)
+        expressions = ['0', '0.0000001', 'x-x', 'x+y-y', 'x', 'x+0.0000001']
+        self.assertEqual([clusters.add(Polynomial(expression))
+                          for expression in expressions], [0, 0, 0, 1, 1, 1])
+        self.assertTrue(Polynomial('x+y-y').compare_by_epsilon(
+            Polynomial('x+0.0000001'), 10**-6))
+
+    def test_cluster_expressions(self):
+        lines = ['x+y\n', '\n', '1/x\n', 'y+x\n']
+        records = list(cluster_expressions(lines))
+        self.assertEqual([record['cluster'] for record in records],
+                         [0, None, 0])
+        self.assertEqual(records[1]['exit_code'], 4)
+        self.assertNotIn('message', records[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+import pathmagic
+from math_methods import dense
+from math_methods.dense import DensePolynomial, convolve, multiply
+from math_methods.polynomial import Polynomial
+from math_methods.signatures import multiply_signatures
+
+
+@unittest.skipIf(dense.numpy is None, 'numpy is not installed')
+class DenseTests(unittest.TestCase):
+    def test_round_trip(self):
+        for string in ['(x+1)^3', '(x-2y)^3', '5x^2+y', '3', 'x-x']:
+            polynomial = Polynomial(string)
+            self.assertEqual(
+                DensePolynomial.from_polynomial(polynomial).to_polynomial(),
+                polynomial)
+        self.assertRaises(ValueError, DensePolynomial.from_polynomial,
+                          Polynomial('x+y+z'))
+        self.assertRaises(OverflowError, DensePolynomial.from_polynomial,
+                          Polynomial('2^70x'))
+        for string in ['0.5x^2+y', '(x+iy)^3']:
+            self.assertRaises(ValueError, DensePolynomial.from_polynomial,
+                              Polynomial(string))
+
+    def test_arithmetic(self):
+        first = Polynomial('(x+2y+3)^3')
+        second = Polynomial('x-5')
+        firstDense = DensePolynomial.from_polynomial(first)
+        secondDense = DensePolynomial.from_polynomial(second)
+        self.assertEqual((firstDense * secondDense).to_polynomial(),
+                         first * second)
+
+    def test_fast_fourier_transform(self):
+        numpy = dense.numpy
+        first = numpy.arange(-1000, 1500, dtype=numpy.int64) % 7 - 3
+        second = numpy.arange(2000, dtype=numpy.int64) % 5 - 2
+        self.assertTrue(numpy.array_equal(
+            convolve(first, second),
+            numpy.convolve(first, second)))
+
+    def test_multiply(self):
+        first = Polynomial('+'.join(
+            '({0})x^{1}'.format(power % 7 - 3, power)
+            for power in range(200)))
+        second = Polynomial('+'.join(
+            '{0}x^{1}y^{2}'.format(power % 5 + 1, power % 8, power // 8)
+            for power in range(80)))
+        product = Polynomial(None)
+        for signature, monomial in first.terms.items():
+            for otherSignature, otherMonomial in second.terms.items():
+                product.add_product(
+                    signature, otherSignature,
+                    monomial.coefficient * otherMonomial.coefficient)
+        self.assertEqual(multiply(first, second), product)
+        self.assertEqual(first * second, product)
+        self.assertIsNone(multiply(first, Polynomial('0.5x')))
+        self.assertIsNone(multiply(first, Polynomial('x+y+z')))
+
+    def test_sparse_operands(self):
+        first = Polynomial('+'.join(
+            'x^{0}y^{1}'.format(power * 37 % 1000, power * 53 % 900)
+            for power in range(64)))
+        self.assertIsNone(multiply(first, first))
+        dense = Polynomial('(x+y+1)^11')
+        self.assertEqual(multiply(dense, dense), Polynomial('(x+y+1)^22'))
+
+    def test_zero_constant_term(self):
+        first = Polynomial('+'.join(
+            'x^{0}y'.format(power) for power in range(64)))
+        second = Polynomial('+'.join(
+            '({0})x^{1}'.format((-1)**power, power) for power in range(64)))
+        sums = {}
+        for signature, monomial in first.terms.items():
+            for otherSignature, otherMonomial in second.terms.items():
+                product = multiply_signatures(signature, otherSignature)
+                sums[product] = sums.get(product, 0) + \
+                    monomial.coefficient * otherMonomial.coefficient
+        expected = Polynomial(None)
+        for signature, coefficient in sums.items():
+            expected.add_term(signature, coefficient)
+        self.assertIn((), expected.terms)
+        for product in [multiply(first, second), first * second]:
+            self.assertEqual(
+                {signature: monomial.coefficient
+                 for signature, monomial in product.terms.items()},
+                {signature: monomial.coefficient
+                 for signature, monomial in expected.terms.items()})
+        self.assertTrue((first * second).compare_by_epsilon(
+            expected + Polynomial('0.0000001'), 10**-6))
+        self.assertIn((), multiply(first + Polynomial('x-x'), second).terms)
+
+
+if __name__ == '__main__':
+    unittest.main()
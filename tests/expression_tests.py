@@ -0,0 +1,121 @@
+import unittest
+import pathmagic
+from math_methods import expressions, polynomial
+from math_methods.budget import Budget
+from math_methods.polynomial import Polynomial
+
+
+class TokenizerTests(unittest.TestCase):
+    def test_tokenize(self):
+        sets = [('2 5,5x', [('number', '25.5'), ('variable', 'x')]),
+                ('x * * 2', [('variable', 'x'), ('^', '**'),
+                             ('number', '2')]),
+                ('i:j', [('imaginary', 'i'), ('/', ':'),
+                         ('variable', 'i')]),
+                ('3%', [('number', '3'), ('unknown', '%')])]
+        for data in sets:
+            tokens = expressions.tokenize(data[0])
+            self.assertEqual([(token.kind, token.text) for token in tokens],
+                             data[1])
+
+    def test_token_positions(self):
+        tokens = expressions.tokenize(' x + 1 2')
+        self.assertEqual([token.position for token in tokens], [1, 3, 5])
+
+
+class ParserTests(unittest.TestCase):
+    def evaluate(self, string: str):
+        return expressions.evaluate_tree(expressions.parse(string))
+
+    def test_evaluate_arithmetic(self):
+        sets = [('2^3^2', 512), ('-2^2', -4), ('6/2(3)', 9.0),
+                ('ii', -1), ('(1+1)(2i)', 4j), ('2i^2', -2),
+                ('((4)/2,5:3+1)', 4 / 2.5 / 3 + 1)]
+        for data in sets:
+            self.assertEqual(self.evaluate(data[0]), data[1])
+
+    def test_division_by_run(self):
+        sets = [('(4)/2*2', 1.0), ('4/2*2', 4.0), ('2^2/2i', 2 / 1j),
+                ('(2)/2i^2', -1.0)]
+        for data in sets:
+            self.assertEqual(self.evaluate(data[0]), data[1])
+
+    def test_incorrect_expressions(self):
+        incorrectExpressions = ['(2', '2+', '07', '1.2.3', '2)', '$']
+        for expression in incorrectExpressions:
+            with self.assertRaises(SyntaxError):
+                expressions.parse(expression)
+
+    def test_arithmetic_flag(self):
+        self.assertTrue(expressions.parse('2(3+i)^2').arithmetic)
+        self.assertFalse(expressions.parse('2(3+x)^2').arithmetic)
+
+    def test_same_as_slicing_parser(self):
+        pairs = [('a/3b', 'ab/3'), ('x/2i1', '-0.5ix'),
+                 ('(x+y)^2/2*2', '(x^2+2xy+y^2)/4'),
+                 ('2,5(x)^(1+1)**2', '2.5x^4')]
+        for pair in pairs:
+            self.assertEqual(Polynomial(pair[0]), Polynomial(pair[1]))
+
+    def test_shared_subexpressions(self):
+        tree = expressions.parse('(x+y)^5-2(x+y)^5')
+        power = tree.operands[0]
+        self.assertIs(tree.operands[1].operands[0].operands[1], power)
+        self.assertIs(expressions.parse('(x + y)^5'), power)
+        # Splitting runs of the bracket group doesn't change
+        # the shared tree of the same expression without brackets.
+        tree = expressions.parse('(4)/2*2')
+        self.assertEqual(self.evaluate('((4)/2*2)'), 4.0)
+        self.assertEqual(expressions.evaluate_tree(tree), 1.0)
+
+    def test_shared_expansions(self):
+        polynomial.expansions.clear()
+        result = Polynomial('(x+y)^5-2(x+y)^5')
+        power = expressions.parse('(x+y)^5')
+        self.assertTrue(polynomial.expansions[power].frozen)
+        self.assertFalse(result.frozen)
+        result.scale(-1)
+        self.assertEqual(result, Polynomial('(x+y)^5'))
+        self.assertEqual(Polynomial('-(x+y)^5'), Polynomial('-1(x+y)^5'))
+
+    def test_expansions_limit(self):
+        polynomial.expansions.clear()
+        Polynomial('(a+b+c+d)^8')
+        self.assertNotIn(expressions.parse('(a+b+c+d)^8'),
+                         polynomial.expansions)
+        self.assertEqual(polynomial.expansions.terms, 4)
+        expansions = polynomial.Expansions(100)
+        for power in range(1, 20):
+            node = expressions.parse('(x+y)^{0}'.format(power))
+            expansions.put(node, Polynomial('(x+y)^{0}'.format(power)))
+            self.assertLessEqual(expansions.terms, 100)
+        self.assertEqual(expansions.terms, sum(range(16, 21)))
+        self.assertEqual(len(expansions), 5)
+        expansions.put(expressions.parse('x^200'),
+                       Polynomial('(x+1)^200'))
+        self.assertEqual(len(expansions), 5)
+
+    def test_deep_nesting(self):
+        depth = 2000
+        self.assertEqual(self.evaluate('(' * depth + '2' + ')' * depth), 2)
+        self.assertEqual(self.evaluate('2' + '^1' * depth), 2)
+        self.assertEqual(self.evaluate('-(' * depth + '2' + ')' * depth), 2)
+        self.assertEqual(Polynomial('(' * depth + 'x+1' + ')' * depth),
+                         Polynomial('x+1'))
+        self.assertEqual(Polynomial('x' + '^1' * depth), Polynomial('x'))
+        self.assertEqual(
+            Polynomial('(' * depth + '1' + '+1)' * depth + 'x'),
+            Polynomial('{0}x'.format(depth + 1)))
+
+    def test_deep_polynomial_nesting(self):
+        depth = 500
+        string = 'x*(1+' * depth + 'x' + ')' * depth
+        expected = Polynomial('+'.join(
+            'x^{0}'.format(power) for power in range(1, depth + 2)))
+        self.assertEqual(Polynomial(string), expected)
+        with Budget(max_terms=10**6):
+            self.assertEqual(Polynomial(string), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import pathmagic
+from math_methods.batch import compare_pair
+from math_methods.identity import compare_trees, degree, is_prime
+from math_methods.identity import parse_expression, random_prime
+
+
+class IdentityTests(unittest.TestCase):
+    def test_primes(self):
+        self.assertEqual([number for number in range(30) if is_prime(number)],
+                         [2, 3, 5, 7, 11, 13, 17, 19, 23, 29])
+        self.assertTrue(is_prime(2**61 - 1))
+        self.assertFalse(is_prime(3215031751))
+        prime, unit = random_prime()
+        self.assertEqual(prime % 4, 1)
+        self.assertEqual(unit * unit % prime, prime - 1)
+
+    def test_degree(self):
+        sets = [('2', 0), ('x+y', 1), ('xy^2+1', 3), ('(x+y)^30', 30),
+                ('(x^2)^(3/3)*x/2', 3)]
+        for string, expected in sets:
+            self.assertEqual(degree(parse_expression(string)), expected)
+
+    def test_parse_expression(self):
+        self.assertRaises(ValueError, parse_expression, '1/x')
+        self.assertRaises(SyntaxError, parse_expression, 'x+')
+        self.assertRaises(TypeError, parse_expression, None)
+        self.assertIsNotNone(parse_expression('(x+1)^2'))
+
+    def test_compare_trees(self):
+        sets = [('(a+b+c+d)^30', '(d+c+(b+a))^15*(a+b+c+d)^15', True),
+                ('(x+i)(x-i)', 'x^2+1', True),
+                ('(x+y)/2', '0,5x+y:2', True),
+                ('2^(0-1)x', 'x/2', True),
+                ('(a+b)^20', '(a+b)^19*(a+b+1)', False),
+                ('x^2+1', 'x^2+1.000001', False),
+                ('x', 'y', False)]
+        for first, second, expected in sets:
+            self.assertEqual(compare_trees(parse_expression(first),
+                                           parse_expression(second)),
+                             expected, (first, second))
+
+    def test_fallback(self):
+        # Irrational numbers can't be reduced modulo prime.
+        self.assertIsNone(compare_trees(parse_expression('2^(1/2)x'),
+                                        parse_expression('x')))
+        record = compare_pair(('2^(1/2)x', '2^(1/2)x'), probability=10**-9)
+        self.assertEqual(record['verdict'], 'equal')
+        record = compare_pair(('x', 'x/0'), probability=10**-9)
+        self.assertEqual(record['exit_code'], 5)
+        # Errors of the first expression are reported first.
+        pair = ('((5-5):(0)^3)', '1/x')
+        self.assertIsNone(parse_expression(pair[0]))
+        self.assertEqual(compare_pair(pair, probability=10**-9),
+                         compare_pair(pair))
+
+
+if __name__ == '__main__':
+    unittest.main()
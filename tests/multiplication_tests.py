@@ -0,0 +1,112 @@
+import unittest
+import pathmagic
+from math_methods import multiplication
+from math_methods.multiplication import karatsuba, multiply_terms
+from math_methods.packed import Packing, multiply_packed
+from math_methods.polynomial import Monomial, Polynomial
+
+
+def nonzero(terms) -> dict:
+    return {key: coefficient for key, coefficient in dict(terms).items()
+            if coefficient}
+
+
+def schoolbook(first: dict, second: dict) -> list:
+    packing = Packing.for_terms(first, second)
+    return [(packing.unpack(key), coefficient)
+            for key, coefficient in multiply_packed(
+                packing.pack_terms(first),
+                packing.pack_terms(second)).items()]
+
+
+def added(terms) -> dict:
+    polynomial = Polynomial(None)
+    for signature, coefficient in terms:
+        polynomial.add_term(signature, coefficient)
+    return {signature: monomial.coefficient
+            for signature, monomial in polynomial.terms.items()}
+
+
+class MultiplicationTests(unittest.TestCase):
+    def test_karatsuba(self):
+        first = {power: (power * power * 3 + 1) % 101 * 10**20
+                 for power in range(200)}
+        second = {power: (power * 7 - 500) * 10**20 for power in range(150)}
+        self.assertEqual(nonzero(karatsuba(first, second)),
+                         nonzero(multiply_packed(first, second)))
+
+    def test_multiply_terms(self):
+        for first, second in [('(x+2y+z+1)^5', '(x-y+3)^7'),
+                              ('(0.5x+1)^40', '(x-0.1)^40')]:
+            first = Polynomial(first).terms
+            second = Polynomial(second).terms
+            self.assertEqual(
+                nonzero(multiply_terms(first, second)),
+                nonzero(schoolbook(first, second)))
+
+    def test_cancellation(self):
+        first = Polynomial('+'.join(
+            'x^{0}'.format(power) for power in range(40)))
+        second = first * Polynomial('x^40-1')
+        self.assertEqual(len(second.terms), 80)
+        self.assertEqual(
+            nonzero(multiply_terms(first.terms, second.terms)),
+            nonzero(schoolbook(first.terms, second.terms)))
+        self.assertEqual(first * second,
+                         first * first * Polynomial('x^40-1'))
+
+    def test_zero_constant_term(self):
+        first = Polynomial('+'.join(
+            'x^{0}y'.format(power) for power in range(40)))
+        second = Polynomial('+'.join(
+            '({0})x^{1}'.format((-1)**power, power) for power in range(40)))
+        for left, right in [(first, second), (first, first),
+                            (first + Polynomial('x-x'), first)]:
+            self.assertEqual(
+                added(multiply_terms(left.terms, right.terms)),
+                added(schoolbook(left.terms, right.terms)))
+        self.assertNotIn((), added(multiply_terms(first.terms, first.terms)))
+
+    def test_threshold(self):
+        threshold = multiplication.KARATSUBA_THRESHOLD
+        try:
+            multiplication.KARATSUBA_THRESHOLD = 2
+            product = Polynomial('(x+y+1)^4') * Polynomial('(x-y-1)^3')
+        finally:
+            multiplication.KARATSUBA_THRESHOLD = threshold
+        self.assertEqual(product, Polynomial('(x+y+1)^4(x-y-1)^3'))
+
+    def test_iterate_product(self):
+        first = Polynomial('(x+2y+z+1)^5')
+        second = Polynomial('(x-0.5y+3)^7')
+        terms = list(first.iterate_product(second))
+        self.assertEqual(dict(terms), nonzero(
+            (signature, monomial.coefficient) for signature, monomial
+            in (first * second).terms.items()))
+        vectors = [tuple(dict(signature).get(variable, 0)
+                         for variable in 'xyz') for signature, _ in terms]
+        self.assertEqual(vectors, sorted(vectors))
+        self.assertEqual(dict(first.iterate_product(Monomial('2x'))),
+                         nonzero((signature, monomial.coefficient)
+                                 for signature, monomial
+                                 in (first * Monomial('2x')).terms.items()))
+        self.assertEqual(list(Polynomial('x-x').iterate_product(first)), [])
+
+    def test_iterate_product_lazily(self):
+        first = Polynomial('+'.join(
+            'x^{0}y^{1}'.format(power, power % 17)
+            for power in range(1, 3000)))
+        self.assertEqual(next(first.iterate_product(first)),
+                         ((('x', 2), ('y', 2)), 1))
+
+    def test_iterate_product_overflow(self):
+        polynomial = Polynomial(None)
+        polynomial.add_term((('x', 2**40), ('y', 2**40)), 1)
+        polynomial.add_term((), 2)
+        self.assertEqual(list(polynomial.iterate_product(polynomial)),
+                         [((), 4), ((('x', 2**40), ('y', 2**40)), 4),
+                          ((('x', 2**41), ('y', 2**41)), 1)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+import pathmagic
+from math_methods.multiplication import multiply_terms
+from math_methods.packed import Packing
+from math_methods.polynomial import Monomial, Polynomial
+
+
+class PackedTests(unittest.TestCase):
+    def test_pack_and_unpack(self):
+        packing = Packing.for_terms(Polynomial('x^3y+z').terms,
+                                    Polynomial('x^4+y^2').terms)
+        self.assertEqual(packing.variables, ['x', 'y', 'z'])
+        self.assertEqual(packing.width, 3)
+        signature = (('x', 7), ('y', 3), ('z', 1))
+        self.assertEqual(packing.unpack(packing.pack(signature)), signature)
+        self.assertEqual(packing.pack(()), 0)
+        self.assertEqual(packing.unpack(0), ())
+
+    def test_overflow(self):
+        terms = {(('x', 2**40), ('y', 2**40)):
+                 Monomial.from_signature((('x', 2**40), ('y', 2**40)), 1)}
+        self.assertIsNone(Packing.for_terms(terms, terms))
+        self.assertIsNone(multiply_terms(terms, terms))
+        polynomial = Polynomial(None)
+        polynomial.terms = terms
+        product = polynomial * polynomial
+        self.assertEqual(list(product.terms),
+                         [(('x', 2**41), ('y', 2**41))])
+        self.assertEqual(polynomial, polynomial.copy())
+
+    def test_multiply(self):
+        first = Polynomial('(0.5x+y+1.5iz)^3')
+        second = Polynomial('x-0.1y+2z+w')
+        product = dict(multiply_terms(first.terms, second.terms))
+        expected = Polynomial(None)
+        for signature, monomial in first.terms.items():
+            for otherSignature, otherMonomial in second.terms.items():
+                expected.add_product(
+                    signature, otherSignature,
+                    monomial.coefficient * otherMonomial.coefficient)
+        self.assertEqual(product, {signature: monomial.coefficient
+                                   for signature, monomial
+                                   in expected.terms.items()})
+        self.assertEqual(dict(multiply_terms(Polynomial('x+y').terms,
+                                             Polynomial('x-y').terms)),
+                         {(('x', 2),): 1, (('x', 1), ('y', 1)): 0,
+                          (('y', 2),): -1})
+
+
+if __name__ == '__main__':
+    unittest.main()
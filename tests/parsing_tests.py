@@ -68,5 +68,25 @@ class MathExpressionTests(unittest.TestCase):
             self.assertEqual(
                 parsing.find_corresponding_bracket(data[0], data[1]), data[2])
 
+    def test_evaluate(self):
+        sets = [('2^(1+1)', 4), ('jj', -1), ('2j3', 6j), ('4/2(3)', 6.0),
+                ('-2^2', -4), ('(1-j)(1+j)', 2), ('2^-1', 0.5)]
+        for data in sets:
+            self.assertEqual(parsing.evaluate(data[0]), data[1])
+
+    def test_evaluate_errors(self):
+        incorrectExpressions = ['1/0', '(2-2)^(0-1)', '(2)3', '07', 'i',
+                                '2+', '__import__']
+        for expression in incorrectExpressions:
+            with self.assertRaises(SyntaxError):
+                parsing.evaluate(expression)
+
+    def test_evaluate_memoization(self):
+        parsing.evaluate.cache_clear()
+        for counter in range(3):
+            parsing.evaluate('(2+3j)^3')
+        self.assertEqual(parsing.evaluate.cache_info().hits, 2)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,9 +1,14 @@
 import itertools
 import math
+import tracemalloc
 import unittest
 import pathmagic
 from math_methods.polynomial import Polynomial, Monomial
 
+# Expanded polynomials take at most this number of bytes per term
+# once their signatures are interned.
+TERM_BYTES_BUDGET = 320
+
 
 class MonomialInitializeTest(unittest.TestCase):
     def test_monomial_initialize(self):
@@ -138,6 +143,16 @@ class PolynomialOperations(unittest.TestCase):
             self.apply_function(lambda x, y: x * y, *chain)
             self.apply_function(lambda x, y: y * x, *chain)
 
+    def test_high_exponents(self):
+        chains = [['(x+y)^6', '((x+y)^2)^3',
+                   'x^6+6x^5y+15x^4y^2+20x^3y^3+15x^2y^4+6xy^5+y^6'],
+                  ['(2xy^2)^5', '32x^5y^10'],
+                  ['(x+y+z+u+v)^3', '(x+y+z+u+v)(x+y+z+u+v)^2'],
+                  ['(x-x^2+1)^4', '(x-x^2+1)^2(x-x^2+1)^2'],
+                  ['(x+y-x)^7', 'y^7']]
+        for chain in chains:
+            self.check_equality_of_items_in_iterable(chain)
+
     def test_compare_by_epsilon(self):
         toCompare = ['2.718281828', '2.7+1828/99990']
         for value in toCompare:
@@ -154,6 +169,137 @@ class PolynomialOperations(unittest.TestCase):
         for chain in chains:
             self.check_equality_of_items_in_iterable(chain)
 
+    def test_monomial_lookup(self):
+        polynomial = Polynomial('x^2y+3yx^2+y-4')
+        self.assertEqual(len(polynomial.monomials), 3)
+        self.assertEqual(polynomial.get_monomial(Monomial('yxx')).coefficient,
+                         4)
+        self.assertEqual(polynomial.find_monomial(Monomial('2y')), 1)
+        self.assertIsNone(polynomial.get_monomial(Monomial('xy')))
+        self.assertEqual(polynomial.find_monomial(Monomial('xy')), -1)
+
+    def test_in_place_operations(self):
+        polynomial = Polynomial('x+y')
+        original = polynomial.copy()
+        same = polynomial
+        polynomial += Polynomial('x-y')
+        polynomial *= Monomial('3x')
+        self.assertIs(polynomial, same)
+        self.assertEqual(polynomial, Polynomial('6x^2'))
+        self.assertEqual(original, Polynomial('y+x'))
+
+    def test_hash_and_fingerprint(self):
+        first = Polynomial('(x+y)^2+0')
+        second = Polynomial('y^2+2,0xy+x^2')
+        self.assertEqual(hash(first), hash(second))
+        self.assertEqual(first.fingerprint(), second.fingerprint())
+        self.assertEqual(len({first, second, Polynomial('x')}), 2)
+        self.assertNotEqual(first.fingerprint(),
+                            Polynomial('(x+y)^2+i').fingerprint())
+        self.assertEqual(Polynomial('0').fingerprint(),
+                         Polynomial('x-x').fingerprint())
+
+    def test_normal_form(self):
+        polynomial = Polynomial('y^3+x-y+x^2y+xy^2-x+0')
+        self.assertEqual(polynomial.normal_form(),
+                         [((('x', 2), ('y', 1)), 1),
+                          ((('x', 1), ('y', 2)), 1),
+                          ((('y', 3),), 1), ((('y', 1),), -1)])
+        self.assertEqual(polynomial.normal_form('grevlex'),
+                         [((('x', 2), ('y', 1)), 1),
+                          ((('x', 1), ('y', 2)), 1),
+                          ((('y', 3),), 1), ((('y', 1),), -1)])
+        self.assertEqual(Polynomial('x^2z+y^3').normal_form('grevlex'),
+                         [((('y', 3),), 1), ((('x', 2), ('z', 1)), 1)])
+        self.assertEqual(Polynomial('x^2z+y^3').normal_form(),
+                         [((('x', 2), ('z', 1)), 1), ((('y', 3),), 1)])
+        self.assertEqual(Polynomial('x-x').normal_form(), [])
+        self.assertRaises(ValueError, polynomial.normal_form, 'deglex')
+
+    def test_normal_form_cache(self):
+        polynomial = Polynomial('x+1')
+        self.assertEqual(polynomial.normal_form(), [((('x', 1),), 1), ((), 1)])
+        polynomial += Polynomial('-1')
+        self.assertEqual(polynomial.normal_form(), [((('x', 1),), 1)])
+        polynomial.scale(2)
+        self.assertEqual(polynomial.normal_form(), [((('x', 1),), 2)])
+        polynomial *= Polynomial('x')
+        self.assertEqual(polynomial.normal_form(), [((('x', 2),), 2)])
+        polynomial.freeze()
+        self.assertEqual(polynomial.normal_form(), [((('x', 2),), 2)])
+        self.assertIsInstance(polynomial.ordered_terms(), tuple)
+
+    def test_exposed_monomials(self):
+        polynomial = Polynomial('x+2y')
+        evaluate = polynomial.compile()
+        for monomial in polynomial.monomials:
+            monomial *= Monomial('3x')
+            monomial.coefficient = 5
+        self.assertEqual(polynomial, Polynomial('x+2y'))
+        self.assertIs(polynomial.compile(), evaluate)
+        self.assertEqual(evaluate(1, 1), 3)
+
+    def test_compile(self):
+        polynomial = Polynomial('(x-2y+3z)^4 + (1+2i)x^3z - 0.5y^7 + 4')
+        evaluate = polynomial.compile()
+        self.assertEqual(evaluate.variables, ('x', 'y', 'z'))
+        for point in itertools.product([-1.5, 0, 2], repeat=3):
+            expected = 0
+            for monomial in polynomial.terms.values():
+                value = monomial.coefficient
+                for variable, exponent in monomial.variables.items():
+                    value *= point['xyz'.index(variable)] ** exponent
+                expected += value
+            self.assertAlmostEqual(evaluate(*point), expected)
+        self.assertAlmostEqual(evaluate(z=1, y=2, x=3), evaluate(3, 2, 1))
+        self.assertEqual(Polynomial('x-x').compile()(), 0)
+        self.assertEqual(Polynomial('7').compile()(), 7)
+        self.assertEqual(Polynomial('x^500+1').compile()(1), 2)
+        evaluate = Polynomial('j^2+2j+ij+k').compile()
+        self.assertEqual(evaluate.variables, ('j', 'k'))
+        self.assertEqual(evaluate(j=2, k=1), 9 + 2j)
+
+    def test_compile_cache(self):
+        polynomial = Polynomial('x+1')
+        evaluate = polynomial.compile()
+        self.assertIs(polynomial.compile(), evaluate)
+        polynomial += Polynomial('y')
+        self.assertEqual(polynomial.compile()(2, 3), 6)
+        polynomial.scale(2)
+        self.assertEqual(polynomial.compile()(2, 3), 12)
+        polynomial.freeze()
+        self.assertIs(polynomial.compile(), polynomial.compile())
+
+    def test_compare_constant_with_zero(self):
+        self.assertTrue(Polynomial('0.0000001').compare_by_epsilon(
+            Polynomial('0'), 10**(-6)))
+        self.assertTrue(Polynomial('x-x').compare_by_epsilon(
+            Polynomial('0.0000001'), 10**(-6)))
+        self.assertFalse(Polynomial('x+0.0000001').compare_by_epsilon(
+            Polynomial('x'), 10**(-6)))
+
+    def test_compact_monomials(self):
+        monomial = Monomial('3x^2y')
+        self.assertFalse(hasattr(monomial, '__dict__'))
+        self.assertEqual(monomial.variables, {'x': 2, 'y': 1})
+        with self.assertRaises(TypeError):
+            monomial.variables['x'] = 1
+        first = Polynomial('(x+y+1)^5')
+        second = Polynomial('(1+y+x)^5*1')
+        for signature in second.terms:
+            self.assertIs(first.terms[signature].signature, signature)
+
+    def test_memory_per_term(self):
+        expression = '(x+y+z+w+1)^12'
+        Polynomial(expression)
+        tracemalloc.start()
+        try:
+            polynomial = Polynomial(expression)
+            size, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertLessEqual(size / len(polynomial.terms), TERM_BYTES_BUDGET)
+
     def test_incorrect_expressions(self):
         incorrectExpressions = ['x + y**(3/0)', 'y/(3-3)']
         for expression in incorrectExpressions:
@@ -0,0 +1,110 @@
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import pathmagic
+from math_methods.budget import Budget
+from math_methods.client import parse_address, send_request
+from math_methods.server import Server, handle_request
+
+
+class ServerTests(unittest.TestCase):
+    def test_parse_address(self):
+        self.assertEqual(parse_address('localhost:8000'), ('localhost', 8000))
+        self.assertEqual(parse_address(':8000'), ('localhost', 8000))
+        self.assertEqual(parse_address('/tmp/polynomials.sock'),
+                         ('/tmp/polynomials.sock', None))
+
+    def test_handle_request(self):
+        record = handle_request({'pair': ['x+y', 'y+x']})
+        self.assertEqual(record['verdict'], 'equal')
+        record = handle_request({'kind': 'check', 'expression': 'x/0',
+                                 'specific': True})
+        self.assertEqual(record['exit_code'], 3)
+        self.assertIn('message', record)
+        record = handle_request({'kind': 'check', 'expression': '(x+y)^3'})
+        self.assertEqual(record, {'error': None, 'exit_code': 0, 'terms': 4})
+        record = handle_request({'pair': ['x', '(x+y)^99']},
+                                budget=Budget(max_degree=50))
+        self.assertEqual(record['exit_code'], 7)
+        with self.assertRaises(ValueError):
+            handle_request({'kind': 'evaluate'})
+        for request in [{'pair': ['x', 'x'], 'epsilon': -1},
+                        {'pair': ['x', 'x'], 'epsilon': 'small'},
+                        {'pair': ['x', 'x'], 'probability': 1.5},
+                        {'pair': ['x', 'x'], 'probability': True},
+                        {'pair': ['x', 'x', 'x']}, {'pair': ['x']}]:
+            response = asyncio.run(Server(1).respond(
+                json.dumps(request).encode('utf-8')))
+            self.assertEqual(response['error'], 'BadRequest')
+
+    def test_broken_pool(self):
+        broken = ProcessPoolExecutor(1)
+        with self.assertRaises(BrokenProcessPool):
+            broken.submit(os._exit, 1).result()
+        server = Server(1)
+        server.executor = broken
+        line = json.dumps({'pair': ['x', 'x']}).encode('utf-8')
+        try:
+            response = asyncio.run(server.respond(line))
+            self.assertEqual(response['error'], 'BrokenProcessPool')
+            self.assertIsNot(server.executor, broken)
+            response = asyncio.run(server.respond(line))
+            self.assertEqual(response['verdict'], 'equal')
+        finally:
+            server.executor.shutdown()
+
+    def test_socket_path(self):
+        with tempfile.NamedTemporaryFile() as file:
+            with self.assertRaises(FileExistsError):
+                asyncio.run(Server(1).serve(file.name))
+            self.assertTrue(os.path.exists(file.name))
+
+    def test_loopback_host(self):
+        for address in ['0.0.0.0:9000', '192.0.2.1:9000']:
+            with self.assertRaises(ValueError):
+                asyncio.run(Server(1).serve(address))
+
+    @unittest.skipIf(not hasattr(asyncio, 'start_unix_server'),
+                     'Unix domain sockets are not supported.')
+    def test_requests(self):
+        directory = tempfile.mkdtemp()
+        address = os.path.join(directory, 'polynomials.sock')
+        loop = asyncio.new_event_loop()
+        task = loop.create_task(Server(1).serve(address))
+
+        def run():
+            try:
+                loop.run_until_complete(task)
+            except asyncio.CancelledError:
+                pass
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        try:
+            for _ in range(100):
+                if os.path.exists(address):
+                    break
+                time.sleep(0.05)
+            response = send_request(address, {'id': 1, 'pair': ['x', 'x']})
+            self.assertEqual(response['verdict'], 'equal')
+            self.assertEqual(response['id'], 1)
+            response = send_request(address, {'pair': ['x', 'x'],
+                                              'timeout': 'never'})
+            self.assertEqual(response['error'], 'BadRequest')
+            self.assertEqual(send_request(address, [])['exit_code'], 2)
+        finally:
+            loop.call_soon_threadsafe(task.cancel)
+            thread.join()
+            loop.close()
+        self.assertFalse(os.path.exists(address))
+        os.rmdir(directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
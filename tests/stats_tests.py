@@ -0,0 +1,51 @@
+import unittest
+import pathmagic
+from math_methods import polynomial, stats
+from math_methods.polynomial import Polynomial
+from math_methods.stats import Stats, measure
+
+
+class StatsTests(unittest.TestCase):
+    def test_stages(self):
+        polynomial.expansions.clear()
+        with Stats() as collector:
+            Polynomial('(x+y)^3').compare_by_epsilon(
+                Polynomial('x+y+1'), 10**-6)
+        report = collector.report()
+        self.assertEqual(report['tokenize']['calls'], 2)
+        self.assertEqual(report['compose']['terms'], 4)
+        self.assertEqual(report['compare_by_epsilon']['calls'], 1)
+        self.assertNotIn('peak_memory', report['tokenize'])
+        self.assertIsNone(stats.current)
+
+    def test_slicing_parser(self):
+        depth = 400
+        with Stats() as collector:
+            result = polynomial.parse_slicing(
+                'x*(1+' * depth + 'x' + ')' * depth)
+        self.assertEqual(len(result.terms), depth + 1)
+        self.assertEqual(collector.report()['parse_composition']['calls'], 1)
+
+    def test_disabled(self):
+        collector = Stats()
+        Polynomial('x+1')
+        self.assertEqual(collector.report(), {})
+
+    def test_recursion(self):
+        @measure('factorial')
+        def factorial(number: int) -> int:
+            return 1 if number < 2 else number * factorial(number - 1)
+
+        with Stats(memory=True) as collector:
+            self.assertEqual(factorial(5), 120)
+            with self.assertRaises(TypeError):
+                factorial(None)
+        stage = collector.report()['factorial']
+        self.assertEqual(stage['calls'], 6)
+        self.assertGreaterEqual(stage['seconds'], 0)
+        self.assertGreaterEqual(stage['peak_memory'], 0)
+        self.assertEqual(collector.frames, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+import pathmagic
+from math_methods import store as storeModule
+from math_methods.batch import compare_pair
+from math_methods.polynomial import Polynomial
+from math_methods.store import PolynomialStore, deserialize, serialize
+
+
+class StoreTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'store.db')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_serialization(self):
+        for string in ['(x+iy)^3', '0', '2,5x^2-1', '(x+y)^20']:
+            polynomial = Polynomial(string)
+            self.assertEqual(deserialize(serialize(polynomial)), polynomial)
+
+    def test_polynomials(self):
+        with PolynomialStore(self.path) as store:
+            self.assertEqual(store.get_polynomial('(x+1)^2'),
+                             Polynomial('x^2+2x+1'))
+            self.assertRaises(ValueError, store.get_polynomial, '1/x')
+        with PolynomialStore(self.path) as store:
+            self.assertIsNotNone(store.load('expansions', storeModule.
+                                            content_hash('(x+1)^(2)')))
+            self.assertEqual(store.get_polynomial('(x + 1)**2'),
+                             Polynomial('x^2+2x+1'))
+
+    def test_records(self):
+        with PolynomialStore(self.path) as store:
+            record = compare_pair(('x', '1/x'), 0.1, store=store)
+            self.assertNotIn('message', record)
+            self.assertEqual(store.get_record(('x', '1/x'), 0.1)['exit_code'],
+                             6)
+            self.assertIsNone(store.get_record(('x', '1/x'), None))
+            # Stored records are used without parsing.
+            store.put_record(('x', 'y'), None, {'verdict': 'equal'})
+            self.assertEqual(compare_pair(('x', 'y'), store=store),
+                             {'verdict': 'equal'})
+
+    def test_eviction(self):
+        with PolynomialStore(self.path, max_entries=3) as store:
+            for power in range(storeModule.EVICTION_INTERVAL):
+                store.get_polynomial('x^{0}'.format(power))
+            count = store.connection.execute(
+                'SELECT COUNT(*) FROM expansions').fetchone()[0]
+            self.assertEqual(count, 3)
+            self.assertIsNotNone(store.load('expansions', storeModule.
+                                            content_hash('(x)^(99)')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+import pathmagic
+from math_methods.complcated_errors import find_complicated_errors
+from math_methods.expressions import tokenize
+from math_methods.trivial_errors import find_trivival_errors
+from math_methods.validation import find_errors, is_suspicious
+
+
+class ValidationTests(unittest.TestCase):
+    def test_correct_expressions(self):
+        for string in ['', '3x**2', 'x+y+x**3+x**2', '2/2', '(x+y)^3',
+                       '1 000x/4', '2,5x', '(x)/(2i)', 'x^(3/3)',
+                       '-(x-y)*(x+y)', '2^3^2', '0^0']:
+            self.assertFalse(is_suspicious(string, tokenize(string)),
+                             string)
+            self.assertIsNone(find_errors(string))
+
+    def test_same_messages(self):
+        for string in ['(x', 'x)', 'x+#', '2 .5', '1.2.3', '.5x', 'x+',
+                       '*x', '(*x)', 'x+-y', '()', 'x* *2', '1/x',
+                       '3/(2/0)', 'x**(2-5)', '(x)**(2)^(i)', '1/0,5',
+                       '5,0^(0-1)', ' 0 ** (3-4)', 'x^i', '2^x',
+                       '0+0/5-(3+2)/(1.5+2.5-4)', 'x**(0**(-2))']:
+            expected = find_trivival_errors(string) or \
+                find_complicated_errors(string)
+            self.assertEqual(find_errors(string, tokenize(string)),
+                             expected, string)
+
+
+if __name__ == '__main__':
+    unittest.main()
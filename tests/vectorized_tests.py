@@ -0,0 +1,52 @@
+import array
+import unittest
+import pathmagic
+from math_methods import vectorized
+from math_methods.polynomial import Polynomial
+from math_methods.vectorized import evaluate_arrays
+
+
+@unittest.skipIf(vectorized.numpy is None, 'numpy is not installed')
+class VectorizedTests(unittest.TestCase):
+    def test_evaluate_arrays(self):
+        numpy = vectorized.numpy
+        polynomial = Polynomial('(x-2y)^5 + 0.5x^3y + 3')
+        random = numpy.random.default_rng(1)
+        values = {'x': random.random(1000), 'y': random.random(1000)}
+        evaluate = polynomial.compile()
+        result = evaluate_arrays(polynomial, values, chunk_points=64)
+        self.assertEqual(result.shape, (1000,))
+        for index in [0, 63, 64, 999]:
+            self.assertAlmostEqual(
+                result[index],
+                evaluate(values['x'][index], values['y'][index]))
+
+    def test_complex_and_buffers(self):
+        numpy = vectorized.numpy
+        result = evaluate_arrays(Polynomial('ix^2+1'),
+                                 {'x': memoryview(array.array('i', [1, 2]))})
+        self.assertEqual(result.tolist(), [1 + 1j, 1 + 4j])
+        result = evaluate_arrays(Polynomial('xy'), {
+            'x': numpy.ones((2, 3)), 'y': numpy.full((2, 3), 2j),
+            'z': numpy.zeros((2, 3))})
+        self.assertEqual(result.shape, (2, 3))
+        self.assertTrue(numpy.all(result == 2j))
+        self.assertEqual(evaluate_arrays(Polynomial('7'), {}), 7)
+        result = evaluate_arrays(Polynomial('j^2+2j+i'),
+                                 {'j': numpy.array([0, 2])})
+        self.assertEqual(result.tolist(), [1j, 8 + 1j])
+
+    def test_incorrect_values(self):
+        numpy = vectorized.numpy
+        self.assertRaises(ValueError, evaluate_arrays, Polynomial('x+y'),
+                          {'x': numpy.ones(2)})
+        with self.assertRaisesRegex(ValueError, 'variables j are'):
+            evaluate_arrays(Polynomial('j^2+2j+i'), {'y': numpy.ones(2)})
+        self.assertRaises(ValueError, evaluate_arrays, Polynomial('x+y'),
+                          {'x': numpy.ones(2), 'y': numpy.ones(3)})
+        self.assertRaises(ValueError, evaluate_arrays, Polynomial('x'),
+                          {'x': numpy.ones(2)}, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()